@@ -117,7 +117,7 @@ def select_optimal_k(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     start_time = time.time()
     completed_jobs = []
     
-    while len(completed_jobs) < len([job for job in training_jobs if job['status'] != 'Failed']) and (time.time() - start_time) < max_wait_time:
+    while len(completed_jobs) < sum(1 for job in training_jobs if job['status'] != 'Failed') and (time.time() - start_time) < max_wait_time:
         for job in training_jobs:
             if job['status'] == 'InProgress' and job['job_arn']:
                 try:
@@ -143,7 +143,7 @@ def select_optimal_k(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     logger.error(f"❌ Error checking job {job['job_name']}: {str(e)}")
         
         # Sleep before next check
-        if len(completed_jobs) < len([job for job in training_jobs if job['status'] != 'Failed']):
+        if len(completed_jobs) < sum(1 for job in training_jobs if job['status'] != 'Failed'):
             time.sleep(10)
     
     # Select optimal K based on metrics
@@ -30,6 +30,7 @@ def lambda_handler(event, context):
     3. compare-models: Compares current and historical models for change detection.
     4. get-model-history: Gets all historical models for a region.
     5. track-model-performance: Tracks model performance over time.
+    6. track-model-performance-batch: Tracks model performance for several tiles in one invocation.
     """
     mode = event.get('mode')
     
@@ -48,8 +49,10 @@ def lambda_handler(event, context):
         return get_model_history(event)
     elif mode == 'track-model-performance':
         return track_model_performance(event)
+    elif mode == 'track-model-performance-batch':
+        return track_model_performance_batch(event)
     else:
-        raise ValueError(f"Invalid mode: '{mode}'. Must be 'get-latest-model', 'save-new-model', 'compare-models', 'get-model-history', or 'track-model-performance'.")
+        raise ValueError(f"Invalid mode: '{mode}'. Must be 'get-latest-model', 'save-new-model', 'compare-models', 'get-model-history', 'track-model-performance', or 'track-model-performance-batch'.")
 
 def get_latest_model(event):
     """
@@ -534,6 +537,46 @@ def track_model_performance(event):
             })
         }
 
+def track_model_performance_batch(event):
+    """
+    Tracks model performance for a batch of tiles in a single invocation.
+    Each entry in 'tiles' is merged over the shared event fields (e.g. 'region',
+    'performance_metrics') and handled as a track-model-performance request.
+    """
+    tiles = event.get('tiles')
+    if not tiles:
+        raise ValueError("Missing 'tiles' for track-model-performance-batch mode.")
+
+    shared_fields = {k: v for k, v in event.items() if k not in ('mode', 'tiles')}
+
+    logger.info(f"📈 Tracking performance for {len(tiles)} tiles")
+
+    results = []
+    for tile in tiles:
+        tile_event = {**shared_fields, **tile}
+        try:
+            results.append(track_model_performance(tile_event))
+        except Exception as e:
+            logger.error(f"❌ Performance tracking failed for tile {tile_event.get('tile_id')}: {str(e)}")
+            results.append({
+                'statusCode': 500,
+                'body': json.dumps({
+                    'status': 'error',
+                    'tile_id': tile_event.get('tile_id'),
+                    'message': str(e)
+                })
+            })
+
+    return {
+        'statusCode': 200,
+        'body': json.dumps({
+            'status': 'success',
+            'tiles_tracked': sum(1 for r in results if r.get('statusCode') == 200),
+            'tiles_failed': sum(1 for r in results if r.get('statusCode') != 200)
+        }),
+        'results': results
+    }
+
 def calculate_cluster_stability_score(model_metadata):
     """
     Calculate a cluster stability score based on model metadata
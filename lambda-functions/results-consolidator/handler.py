@@ -1,22 +1,26 @@
 import json
 import logging
+import re
 import time
 import os
 import boto3
 import base64
-from typing import Dict, Any, List
-from statistics import mean, stdev
+import gzip
+from typing import Dict, Any, List, Tuple, BinaryIO
 from datetime import datetime
 from io import BytesIO
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-# PDF generation imports
-from reportlab.lib.pagesizes import letter, A4
+# PDF generation imports - ReportLab is pure Python wheels only; HTML renderers
+# (WeasyPrint/Chromium) would need cairo/pango or a browser in the Lambda image
+from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
-from reportlab.platypus.tableofcontents import TableOfContents
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,9 +29,245 @@ logger = logging.getLogger(__name__)
 # Environment variables
 API_BASE_URL = os.environ.get('FORESTSHIELD_API_BASE_URL', 'http://localhost:3000')
 PROCESSED_DATA_BUCKET = os.environ.get('PROCESSED_DATA_BUCKET', 'forestshield-processed-data')
+# Per-image table is the largest table in the detailed PDF - debug aid only, off by default
+INCLUDE_PER_IMAGE_TABLE = os.environ.get('FS_PDF_INCLUDE_ROWS', '0') == '1'
+
+# Vegetation-analyzer statuses that count as a successful analysis
+SUCCESS_STATUSES = frozenset(('COMPLETED', 'COMPLETED_WITH_MODEL_REUSE'))
+
+# Acquisition date in a Sentinel-2 image ID: all-digit second segment starting YYYYMMDD (e.g. S2A_20250601_...).
+# Month/day ranges are checked here so malformed IDs miss the match instead of raising in datetime()
+_S2_DATE_RE = re.compile(r'^[^_]*_(\d{4})(0[1-9]|1[0-2])(0[1-9]|[12]\d|3[01])\d*(?:_|$)')
+
+# Traditional NDVI threshold bands: < 0.3 deforested, 0.3-0.5 degraded, >= 0.5 healthy
+_THRESHOLD_NDVI_BANDS = (0.3, 0.5)
+# Vegetation coverage (%) bands: < 30 potential deforestation, 30-60 degradation, >= 60 healthy forest
+_VEGETATION_COVERAGE_BANDS = (30, 60)
+# Detection delay buckets (hours): < 6, 6-24, 1-3 days, 3-7 days, > 1 week
+_DELAY_CATEGORY_BOUNDS = (6, 24, 72, 168)
+_DELAY_CATEGORIES = ('REAL_TIME', 'SAME_DAY', 'NEAR_REAL_TIME', 'WEEKLY', 'DELAYED')
+# Overall alert quality weights: temporal, sensitivity, false positive, threshold improvement
+_QUALITY_WEIGHTS = (0.25, 0.30, 0.30, 0.15)
+# Letter grade per quality score band - a score at a threshold gets the higher grade
+_QUALITY_GRADE_THRESHOLDS = (0.4, 0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9)
+_QUALITY_GRADES = ('F', 'D', 'C-', 'C', 'C+', 'B-', 'B', 'B+', 'A-', 'A', 'A+')
+# False positive risk/protective factor messages, in evaluation order
+_FP_RISK_MESSAGES = (
+    'High alert with low confidence - potential false positive',
+    'High vegetation coverage with deforestation alert - needs verification',
+    'Low spatial coherence - possible isolated false detection'
+)
+_FP_PROTECTIVE_MESSAGES = (
+    'High historical consistency reduces false positive risk',
+    'Excellent data quality reduces false positive risk',
+    'High model reuse efficiency indicates stable detection',
+    'Multi-region analysis ({unique_tiles} regions) increases reliability'
+)
+
+# SNS email subject prefix per risk level
+_SUBJECT_PREFIXES = {
+    'HIGH': '🚨 URGENT',
+    'MEDIUM': '⚠️ WARNING',
+    'INFO': 'ℹ️ INFO'
+}
+
+# Simplified SNS alert email - the detailed analysis lives in the PDF report
+_EMAIL_TEMPLATE = """🛡️ ForestShield Forest Monitoring Alert
+
+🎯 ALERT LEVEL: {risk_level}
+🔍 STATUS: {description}
+🎯 CONFIDENCE: {confidence_level} ({overall_confidence:.1%})
+
+📊 QUICK SUMMARY:
+• Images Analyzed: {successful_analyses}/{total_images}
+• Average Vegetation Coverage: {avg_vegetation_coverage:.1f}%
+• Average NDVI: {avg_ndvi:.3f}
+• Data Quality: {data_quality_percentage:.1f}% valid pixels
+
+💡 RECOMMENDED ACTION: {action_required}
+
+📄 DETAILED ANALYSIS:
+A comprehensive PDF report with complete analysis details,
+including vegetation metrics, confidence analysis, intelligent
+model insights, and technical details is available for download:
+
+{download_line}
+⏰ Link expires: 7 days from analysis
+
+📧 MANAGE ALERTS:
+• Dashboard: {api_base_url}/dashboard/alerts
+• Unsubscribe: {api_base_url}/dashboard/alerts/unsubscribe
+
+Analysis completed: {completed_at} UTC
+
+🛡️ ForestShield - Protecting our forests with satellite intelligence"""
 
 # Initialize AWS clients
 lambda_client = boto3.client('lambda')
+_S3_CLIENT = None
+
+
+def _s3():
+    """S3 client shared across warm invocations, created on first use"""
+    global _S3_CLIENT
+    if _S3_CLIENT is None:
+        _S3_CLIENT = boto3.client('s3')
+    return _S3_CLIENT
+
+
+def _processing_timestamp(now: datetime) -> str:
+    """UTC processing_timestamp shared by the success and failure responses (second precision)"""
+    return now.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+# Worker for S3 uploads that can run while the main thread builds the PDF report
+_BACKGROUND_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# PDF styles - built once per container instead of on every report
+_STYLES = getSampleStyleSheet()
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    spaceAfter=12,
+    textColor=HexColor('#1F4E79'),
+    fontName='Helvetica-Bold'
+)
+
+_FAILURE_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    spaceAfter=12,
+    textColor=HexColor('#8B0000'),  # Dark red
+    fontName='Helvetica-Bold'
+)
+
+_NORMAL_STYLE = _STYLES['Normal']
+
+# Shared table layout
+_METRIC_VALUE_HEADER = ('Metric', 'Value')
+_SUMMARY_COL_WIDTHS = (2*inch, 3*inch)
+_METRIC_COL_WIDTHS = (2.5*inch, 2.5*inch)
+_IMAGE_COL_WIDTHS = (2*inch, 1.5*inch, 1*inch, 1.5*inch)
+_VISUALIZATION_COL_WIDTHS = (2*inch, 4*inch)
+_FAILURE_COL_WIDTHS = (2*inch, 1.5*inch, 2.5*inch)
+
+# Static report text
+_TECH_DETAILS = (
+    "• Satellite Data Source: Sentinel-2",
+    "• Analysis Method: K-means clustering with 5D features (NDVI, Red, NIR, Latitude, Longitude)",
+    "• NDVI Calculation: (NIR - Red) / (NIR + Red)",
+    "• Machine Learning: Intelligent model reuse and historical comparison",
+    "• Processing: Real-time AWS Lambda functions",
+    "• Storage: Amazon S3 with automated lifecycle management"
+)
+
+_FAILURE_CAUSES = (
+    "• Satellite data access issues or API downtime",
+    "• Processing system problems or resource limitations",
+    "• Network connectivity issues or timeouts",
+    "• Lambda function errors or configuration problems",
+    "• AWS service outages or regional issues",
+    "• Data format inconsistencies or corrupted images"
+)
+
+_FAILURE_ACTIONS = (
+    "• Check AWS CloudWatch logs for detailed error information",
+    "• Verify satellite data source availability and access permissions",
+    "• Review Lambda function configuration and resource limits",
+    "• Check network connectivity and security group settings",
+    "• Monitor AWS service status for any ongoing outages",
+    "• Validate input data format and integrity",
+    "• Contact system administrator if issues persist"
+)
+
+# Report title and footer are static text, so they are drawn straight onto the
+# page canvas instead of going through Paragraph layout. PDF text stays free of
+# emoji - the built-in Helvetica fonts have no glyphs for them (email keeps them)
+_PAGE_TITLE_HEIGHT = 64  # Space reserved at the top of the first frame for the title
+_PDF_FOOTER_LINES = (
+    "This report was generated automatically by ForestShield forest monitoring system.",
+    "ForestShield - Protecting our forests with satellite intelligence"
+)
+_FAILURE_PDF_FOOTER_LINES = (
+    "This failure report was generated automatically by ForestShield monitoring system.",
+    "ForestShield - Protecting our forests with satellite intelligence"
+)
+
+
+def _page_decorators(title: str, title_color: HexColor, footer_lines: Tuple[str, ...]):
+    """Build onFirstPage/onLaterPages callbacks drawing the report title and footer on the canvas"""
+    
+    def draw_footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont('Helvetica-Oblique', 8)
+        for i, line in enumerate(reversed(footer_lines)):
+            canvas.drawString(doc.leftMargin, 20 + i * 10, line)
+        canvas.restoreState()
+    
+    def draw_first_page(canvas, doc):
+        canvas.saveState()
+        canvas.setFont('Helvetica-Bold', 18)
+        canvas.setFillColor(title_color)
+        canvas.drawString(doc.leftMargin, doc.pagesize[1] - doc.topMargin - 18, title)
+        canvas.restoreState()
+        draw_footer(canvas, doc)
+    
+    return draw_first_page, draw_footer
+
+
+_REPORT_FIRST_PAGE, _REPORT_LATER_PAGES = _page_decorators(
+    "ForestShield Deforestation Detection Report", HexColor('#2E8B57'), _PDF_FOOTER_LINES
+)
+_FAILURE_FIRST_PAGE, _FAILURE_LATER_PAGES = _page_decorators(
+    "ForestShield System Failure Report", HexColor('#DC143C'), _FAILURE_PDF_FOOTER_LINES  # Crimson for error
+)
+
+# Table styles - header/grid commands shared through a parent style, each table adds only
+# its colours and font sizes (cell ALIGN already defaults to LEFT)
+_BASE_TABLE_STYLE = TableStyle([
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+_DEFAULT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige)
+], parent=_BASE_TABLE_STYLE)
+
+_IMAGE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige)
+], parent=_BASE_TABLE_STYLE)
+
+_VISUALIZATION_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige)
+], parent=_BASE_TABLE_STYLE)
+
+_FAILURE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.lightcoral)
+], parent=_BASE_TABLE_STYLE)
+
+_FAILURE_DETAILS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.lightcoral),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP')
+], parent=_BASE_TABLE_STYLE)
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -47,22 +287,25 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     
     start_time = time.time()
+    # Single clock read shared by every timestamp in this invocation's reports and metrics
+    now = datetime.utcnow()
     
     try:
         logger.info(f"🔍 Starting results consolidation - Request ID: {context.aws_request_id}")
         logger.info(f"📥 Processing {len(event)} image results")
         
-        # Extract successful results - include both completion statuses
-        success_statuses = ['COMPLETED', 'COMPLETED_WITH_MODEL_REUSE']
-        successful_results = [r for r in event if r.get('status') in success_statuses]
-        failed_results = [r for r in event if r.get('status') not in success_statuses]
+        # Split successful/failed results in a single pass - include both completion statuses
+        successful_results = []
+        failed_results = []
+        for r in event:
+            (successful_results if r.get('status') in SUCCESS_STATUSES else failed_results).append(r)
         
         logger.info(f"✅ Successful analyses: {len(successful_results)}")
         logger.info(f"❌ Failed analyses: {len(failed_results)}")
         
         if not successful_results:
             # No successful results - generate failure report
-            return generate_failure_report(event, failed_results, start_time)
+            return generate_failure_report(event, failed_results, start_time, now)
         
         # Calculate aggregate statistics
         statistics = calculate_aggregate_statistics(successful_results)
@@ -78,13 +321,22 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             statistics=statistics,
             risk_assessment=risk_assessment,
             confidence_scores=confidence_scores,
-            processing_results=successful_results
+            processing_results=successful_results,
+            now=now
         )
         
+        # Store quality metrics to S3 for historical tracking in the background, overlapping PDF generation
+        quality_store_future = None
+        if 'error' not in alert_quality_metrics:
+            quality_store_future = _BACKGROUND_EXECUTOR.submit(
+                store_alert_quality_metrics, _s3(), alert_quality_metrics, successful_results, now
+            )
+        
         # Generate detailed PDF report and upload to S3
         pdf_download_url = None
         try:
-            pdf_report = generate_detailed_pdf_report(
+            pdf_buffer = BytesIO()
+            pdf_size = generate_detailed_pdf_report(
                 statistics=statistics,
                 risk_assessment=risk_assessment,
                 confidence_scores=confidence_scores,
@@ -92,18 +344,25 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 successful_analyses=len(successful_results),
                 failed_analyses=len(failed_results),
                 processing_results=successful_results,
-                alert_quality_metrics=alert_quality_metrics
+                alert_quality_metrics=alert_quality_metrics,
+                now=now,
+                sink=pdf_buffer
             )
             
-            # Upload PDF to S3 and get pre-signed URL
-            pdf_download_url = upload_pdf_to_s3(pdf_report, risk_assessment['level'])
+            # Stream the PDF buffer to S3 and get pre-signed URL
+            with pdf_buffer:
+                pdf_download_url = upload_pdf_to_s3(pdf_buffer, risk_assessment['level'], now)
             
-            logger.info(f"📄 PDF report generated and uploaded successfully ({len(pdf_report)} bytes)")
+            logger.info(f"📄 PDF report generated and uploaded successfully ({pdf_size} bytes)")
             
         except Exception as e:
             logger.error(f"❌ PDF generation failed: {str(e)}")
             pdf_download_url = None
         
+        # Quality metrics upload must finish before the Lambda returns and is frozen
+        if quality_store_future:
+            quality_store_future.result()
+        
         # Generate email content with confidence information (AFTER PDF generation)
         email_content = generate_email_content(
             statistics=statistics,
@@ -113,7 +372,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             successful_analyses=len(successful_results),
             failed_analyses=len(failed_results),
             processing_results=successful_results,
-            pdf_download_url=pdf_download_url
+            pdf_download_url=pdf_download_url,
+            now=now
         )
         
         # Calculate processing time
@@ -125,7 +385,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'total_images_processed': len(event),
             'successful_analyses': len(successful_results),
             'failed_analyses': len(failed_results),
-            'processing_timestamp': datetime.utcnow().isoformat() + 'Z',
+            'processing_timestamp': _processing_timestamp(now),
             'statistics': statistics,
             'risk_assessment': risk_assessment,
             'confidence_scores': confidence_scores,
@@ -139,30 +399,34 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'results': event  # Include original results for reference
         }
         
-        # Track model performance for each analyzed tile
+        # Track model performance for all analyzed tiles in a single batched invoke
         try:
-            for result in successful_results:
-                if result.get('imageId'):
-                    tile_id = result['imageId'].split('_')[0]
-                    
-                    # Invoke model-manager for performance tracking
-                    lambda_client.invoke(
-                        FunctionName='forestshield-model-manager',
-                        InvocationType='Event',  # Async invoke - don't wait
-                        Payload=json.dumps({
-                            'mode': 'track-model-performance',
-                            'tile_id': tile_id,
-                            'model_metadata': {
-                                'model_s3_path': result.get('sagemaker_training_data', ''),
-                                'source_image_id': result.get('imageId', ''),
-                                'processing_time_ms': processing_time_ms,
-                                'pixels_analyzed': result.get('pixel_count', 0),
-                                'model_reused': result.get('model_reused', False)
-                            },
-                            'performance_metrics': confidence_scores
-                        })
-                    )
-            logger.info("📊 Performance tracking initiated for all tiles")
+            tiles_payload = [
+                {
+                    'tile_id': _tile_id(result['imageId']),
+                    'model_metadata': {
+                        'model_s3_path': result.get('sagemaker_training_data', ''),
+                        'source_image_id': result.get('imageId', ''),
+                        'processing_time_ms': processing_time_ms,
+                        'pixels_analyzed': result.get('pixel_count', 0),
+                        'model_reused': result.get('model_reused', False)
+                    }
+                }
+                for result in successful_results if result.get('imageId')
+            ]
+            
+            if tiles_payload:
+                # Invoke model-manager for performance tracking
+                lambda_client.invoke(
+                    FunctionName='forestshield-model-manager',
+                    InvocationType='Event',  # Async invoke - don't wait
+                    Payload=json.dumps({
+                        'mode': 'track-model-performance-batch',
+                        'tiles': tiles_payload,
+                        'performance_metrics': confidence_scores
+                    })
+                )
+            logger.info(f"📊 Performance tracking initiated for {len(tiles_payload)} tiles")
         except Exception as e:
             logger.warning(f"⚠️ Performance tracking failed (non-critical): {str(e)}")
         
@@ -211,20 +475,41 @@ def calculate_aggregate_statistics(results: List[Dict[str, Any]]) -> Dict[str, f
             total_pixels += stats.get('total_pixels', 0)
             valid_pixels += stats.get('valid_pixels', 0)
     
+    avg_vegetation, std_vegetation = _mean_stdev(vegetation_coverages)
+    avg_ndvi, std_ndvi = _mean_stdev(ndvi_means)
+    
     return {
-        'avg_vegetation_coverage': mean(vegetation_coverages) if vegetation_coverages else 0.0,
+        'avg_vegetation_coverage': avg_vegetation,
         'min_vegetation_coverage': min(vegetation_coverages) if vegetation_coverages else 0.0,
         'max_vegetation_coverage': max(vegetation_coverages) if vegetation_coverages else 0.0,
-        'std_vegetation_coverage': stdev(vegetation_coverages) if len(vegetation_coverages) > 1 else 0.0,
-        'avg_ndvi': mean(ndvi_means) if ndvi_means else 0.0,
+        'std_vegetation_coverage': std_vegetation,
+        'avg_ndvi': avg_ndvi,
         'min_ndvi': min(ndvi_mins) if ndvi_mins else 0.0,
         'max_ndvi': max(ndvi_maxs) if ndvi_maxs else 0.0,
-        'std_ndvi': stdev(ndvi_means) if len(ndvi_means) > 1 else 0.0,
+        'std_ndvi': std_ndvi,
         'total_pixels_analyzed': total_pixels,
         'valid_pixels_analyzed': valid_pixels,
         'data_quality_percentage': (valid_pixels / total_pixels * 100) if total_pixels > 0 else 0.0
     }
 
+def _mean_stdev(values: List[float]) -> Tuple[float, float]:
+    """Single-pass (Welford) mean and sample standard deviation; (0.0, 0.0) for empty input"""
+    
+    n = 0
+    running_mean = 0.0
+    m2 = 0.0
+    for x in values:
+        n += 1
+        delta = x - running_mean
+        running_mean += delta / n
+        m2 += delta * (x - running_mean)
+    
+    return running_mean, (m2 / (n - 1)) ** 0.5 if n > 1 else 0.0
+
+def _tile_id(image_id: str) -> str:
+    """Tile prefix of an image ID (text before the first underscore), without building a split list"""
+    return image_id.partition('_')[0]
+
 def assess_deforestation_risk(statistics: Dict[str, float], processing_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Intelligent cluster-based risk assessment using model comparison
@@ -293,8 +578,7 @@ def analyze_model_usage(processing_results: List[Dict[str, Any]]) -> Dict[str, A
         # Extract tile_id from imageId
         image_id = result.get('imageId', '')
         if image_id:
-            tile_id = image_id.split('_')[0]  # e.g., S2A_22MBU_... -> S2A
-            unique_tiles.add(tile_id)
+            unique_tiles.add(_tile_id(image_id))  # e.g., S2A_22MBU_... -> S2A
     
     return {
         'total_images': len(processing_results),
@@ -310,14 +594,11 @@ def perform_cluster_change_detection(processing_results: List[Dict[str, Any]]) -
     """
     try:
         # Group results by tile_id to find temporal comparisons
-        tile_groups = {}
+        tile_groups = defaultdict(list)
         for result in processing_results:
             image_id = result.get('imageId', '')
             if image_id:
-                tile_id = image_id.split('_')[0]
-                if tile_id not in tile_groups:
-                    tile_groups[tile_id] = []
-                tile_groups[tile_id].append(result)
+                tile_groups[_tile_id(image_id)].append(result)
         
         change_detections = []
         
@@ -391,6 +672,10 @@ def determine_intelligent_risk_level(model_analysis: Dict[str, Any], change_dete
     Determine risk level based on intelligent model analysis and change detection
     """
     
+    avg_vegetation = statistics['avg_vegetation_coverage']
+    avg_ndvi = statistics['avg_ndvi']
+    data_quality = statistics['data_quality_percentage']
+    
     # Check for significant change detection results
     high_risk_indicators = []
     medium_risk_indicators = []
@@ -422,12 +707,10 @@ def determine_intelligent_risk_level(model_analysis: Dict[str, Any], change_dete
         info_indicators.append(f"Multi-region analysis: {unique_tiles} different areas")
     
     # Add traditional metrics as supplementary info
-    avg_vegetation = statistics['avg_vegetation_coverage']
-    avg_ndvi = statistics['avg_ndvi']
     info_indicators.extend([
         f'Average vegetation coverage: {avg_vegetation:.1f}%',
         f'Average NDVI: {avg_ndvi:.3f}',
-        f'Data quality: {statistics["data_quality_percentage"]:.1f}% valid pixels'
+        f'Data quality: {data_quality:.1f}% valid pixels'
     ])
     
     # Determine final risk level
@@ -470,6 +753,10 @@ def calculate_confidence_scores(processing_results: List[Dict[str, Any]], statis
     try:
         logger.info("Calculating confidence scores...")
         
+        data_quality_percentage = statistics.get('data_quality_percentage', 0)
+        ndvi_variance = statistics.get('std_vegetation_coverage', 0)
+        ndvi_mean = statistics.get('avg_vegetation_coverage', 0)
+        
         confidence_metrics = {
             'distance_to_center_confidence': 0.0,
             'historical_consistency_confidence': 0.0,
@@ -482,9 +769,8 @@ def calculate_confidence_scores(processing_results: List[Dict[str, Any]], statis
         # 1. Data Quality Confidence (based on valid pixels and processing success)
         total_images = len(processing_results)
         # Count successful analyses using both completion statuses
-        success_statuses = ['COMPLETED', 'COMPLETED_WITH_MODEL_REUSE']
-        successful_images = len([r for r in processing_results if r.get('status') in success_statuses])
-        data_quality_score = (successful_images / total_images) * (statistics.get('data_quality_percentage', 0) / 100.0)
+        successful_images = sum(1 for r in processing_results if r.get('status') in SUCCESS_STATUSES)
+        data_quality_score = (successful_images / total_images) * (data_quality_percentage / 100.0)
         confidence_metrics['data_quality_confidence'] = data_quality_score
         
         if data_quality_score > 0.9:
@@ -507,9 +793,6 @@ def calculate_confidence_scores(processing_results: List[Dict[str, Any]], statis
             confidence_metrics['confidence_factors'].append("Low model consistency (<50% reuse)")
         
         # 3. Spatial Coherence Confidence (based on NDVI variance)
-        ndvi_variance = statistics.get('std_vegetation_coverage', 0)
-        ndvi_mean = statistics.get('avg_vegetation_coverage', 0)
-        
         # Lower variance relative to mean indicates better spatial coherence
         if ndvi_mean > 0:
             coefficient_of_variation = ndvi_variance / ndvi_mean
@@ -531,8 +814,7 @@ def calculate_confidence_scores(processing_results: List[Dict[str, Any]], statis
         for result in processing_results:
             image_id = result.get('imageId', '')
             if image_id:
-                tile_id = image_id.split('_')[0]
-                unique_tiles.add(tile_id)
+                unique_tiles.add(_tile_id(image_id))
         
         multi_region_factor = min(len(unique_tiles) / 3.0, 1.0)  # Bonus for covering multiple regions
         if len(unique_tiles) > 1:
@@ -626,27 +908,30 @@ def extract_visualization_links(processing_results: List[Dict[str, Any]]) -> Dic
     return visualization_links
 
 
-def upload_pdf_to_s3(pdf_bytes: bytes, risk_level: str) -> str:
-    """Upload PDF report to S3 and return pre-signed URL"""
+def upload_pdf_to_s3(pdf_file: BinaryIO, risk_level: str, now: datetime) -> str:
+    """Stream a PDF report file object to S3 and return pre-signed URL"""
     
     try:
-        s3_client = boto3.client('s3')
+        s3_client = _s3()
         
         # Generate unique filename
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         filename = f"reports/{timestamp}/ForestShield_Report_{risk_level}_{timestamp}.pdf"
         
-        # Upload to S3
-        s3_client.put_object(
-            Bucket=PROCESSED_DATA_BUCKET,
-            Key=filename,
-            Body=pdf_bytes,
-            ContentType='application/pdf',
-            ServerSideEncryption='AES256',
-            Metadata={
-                'risk-level': risk_level,
-                'generated-by': 'forestshield-results-consolidator',
-                'timestamp': timestamp
+        # Upload to S3 straight from the report buffer - no intermediate bytes copy
+        pdf_file.seek(0)
+        s3_client.upload_fileobj(
+            pdf_file,
+            PROCESSED_DATA_BUCKET,
+            filename,
+            ExtraArgs={
+                'ContentType': 'application/pdf',
+                'ServerSideEncryption': 'AES256',
+                'Metadata': {
+                    'risk-level': risk_level,
+                    'generated-by': 'forestshield-results-consolidator',
+                    'timestamp': timestamp
+                }
             }
         )
         
@@ -668,75 +953,47 @@ def upload_pdf_to_s3(pdf_bytes: bytes, risk_level: str) -> str:
 def generate_detailed_pdf_report(statistics: Dict[str, float], risk_assessment: Dict[str, Any], 
                                confidence_scores: Dict[str, Any], total_images: int, successful_analyses: int, 
                                failed_analyses: int, processing_results: List[Dict[str, Any]], 
-                               alert_quality_metrics: Dict[str, Any]) -> bytes:
-    """Generate a comprehensive PDF report with all analysis details"""
-    
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-    
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        textColor=HexColor('#2E8B57'),
-        fontName='Helvetica-Bold'
-    )
+                               alert_quality_metrics: Dict[str, Any], now: datetime, sink: BinaryIO) -> int:
+    """Write a comprehensive PDF report with all analysis details to sink, returning its size in bytes"""
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        textColor=HexColor('#1F4E79'),
-        fontName='Helvetica-Bold'
-    )
+    doc = SimpleDocTemplate(sink, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=48)
     
     story = []
     
-    # Title
-    story.append(Paragraph("🛡️ ForestShield Deforestation Detection Report", title_style))
-    story.append(Spacer(1, 12))
+    # Title is drawn on the first page canvas
+    story.append(Spacer(1, _PAGE_TITLE_HEIGHT))
     
     # Executive Summary
-    story.append(Paragraph("Executive Summary", heading_style))
+    story.append(Paragraph("Executive Summary", _HEADING_STYLE))
     
     risk_level = risk_assessment['level']
     confidence_level = confidence_scores['confidence_level']
+    overall_confidence = confidence_scores['overall_confidence']
+    risk_factors = risk_assessment['risk_factors']
+    confidence_factors = confidence_scores.get('confidence_factors', [])
     
     summary_data = [
-        ['Metric', 'Value'],
+        _METRIC_VALUE_HEADER,
         ['Alert Level', risk_level],
-        ['Confidence', f"{confidence_level} ({confidence_scores['overall_confidence']:.1%})"],
+        ['Confidence', f"{confidence_level} ({overall_confidence:.1%})"],
         ['Risk Priority', risk_assessment['priority']],
         ['Status', risk_assessment['description']],
-        ['Analysis Date', datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')],
+        ['Analysis Date', now.strftime('%Y-%m-%d %H:%M:%S UTC')],
         ['Images Processed', f"{successful_analyses}/{total_images}"],
         ['Data Quality', f"{statistics['data_quality_percentage']:.1f}% valid pixels"]
     ]
     
-    summary_table = Table(summary_data, colWidths=[2*inch, 3*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    summary_table = Table(summary_data, colWidths=_SUMMARY_COL_WIDTHS)
+    summary_table.setStyle(_DEFAULT_TABLE_STYLE)
     
     story.append(summary_table)
     story.append(Spacer(1, 20))
     
     # Vegetation Analysis
-    story.append(Paragraph("Vegetation Analysis", heading_style))
+    story.append(Paragraph("Vegetation Analysis", _HEADING_STYLE))
     
     vegetation_data = [
-        ['Metric', 'Value'],
+        _METRIC_VALUE_HEADER,
         ['Average Vegetation Coverage', f"{statistics['avg_vegetation_coverage']:.1f}%"],
         ['Vegetation Range', f"{statistics['min_vegetation_coverage']:.1f}% - {statistics['max_vegetation_coverage']:.1f}%"],
         ['Standard Deviation', f"{statistics['std_vegetation_coverage']:.2f}%"],
@@ -747,40 +1004,31 @@ def generate_detailed_pdf_report(statistics: Dict[str, float], risk_assessment:
         ['Valid Pixels', f"{statistics['valid_pixels_analyzed']:,}"]
     ]
     
-    vegetation_table = Table(vegetation_data, colWidths=[2.5*inch, 2.5*inch])
-    vegetation_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    vegetation_table = Table(vegetation_data, colWidths=_METRIC_COL_WIDTHS)
+    vegetation_table.setStyle(_DEFAULT_TABLE_STYLE)
     
     story.append(vegetation_table)
     story.append(Spacer(1, 20))
     
     # Risk Assessment Details
-    story.append(Paragraph("Risk Assessment Details", heading_style))
+    story.append(Paragraph("Risk Assessment Details", _HEADING_STYLE))
     
-    for risk_factor in risk_assessment['risk_factors']:
-        story.append(Paragraph(f"• {risk_factor}", styles['Normal']))
+    if risk_factors:
+        story.append(Paragraph("<br/>".join(f"• {risk_factor}" for risk_factor in risk_factors), _NORMAL_STYLE))
     
     story.append(Spacer(1, 12))
-    story.append(Paragraph(f"<b>Recommended Action:</b> {risk_assessment['action_required']}", styles['Normal']))
+    story.append(Paragraph(f"<b>Recommended Action:</b> {risk_assessment['action_required']}", _NORMAL_STYLE))
     story.append(Spacer(1, 20))
     
     # Confidence Analysis
-    story.append(Paragraph("Confidence Analysis", heading_style))
-    story.append(Paragraph(f"<b>Overall Confidence:</b> {confidence_scores['confidence_level']} ({confidence_scores['overall_confidence']:.1%})", styles['Normal']))
-    story.append(Paragraph(f"<b>Assessment:</b> {confidence_scores['confidence_description']}", styles['Normal']))
+    story.append(Paragraph("Confidence Analysis", _HEADING_STYLE))
+    story.append(Paragraph(f"<b>Overall Confidence:</b> {confidence_level} ({overall_confidence:.1%})", _NORMAL_STYLE))
+    story.append(Paragraph(f"<b>Assessment:</b> {confidence_scores['confidence_description']}", _NORMAL_STYLE))
     story.append(Spacer(1, 12))
     
-    story.append(Paragraph("<b>Confidence Factors:</b>", styles['Normal']))
-    for factor in confidence_scores.get('confidence_factors', []):
-        story.append(Paragraph(f"• {factor}", styles['Normal']))
+    story.append(Paragraph("<b>Confidence Factors:</b>", _NORMAL_STYLE))
+    if confidence_factors:
+        story.append(Paragraph("<br/>".join(f"• {factor}" for factor in confidence_factors), _NORMAL_STYLE))
     
     story.append(Spacer(1, 20))
     
@@ -789,10 +1037,10 @@ def generate_detailed_pdf_report(statistics: Dict[str, float], risk_assessment:
     change_detection = risk_assessment.get('change_detection', {})
     
     if model_analysis.get('status') != 'fallback_mode':
-        story.append(Paragraph("Intelligent Analysis", heading_style))
+        story.append(Paragraph("Intelligent Analysis", _HEADING_STYLE))
         
         intelligence_data = [
-            ['Metric', 'Value'],
+            _METRIC_VALUE_HEADER,
             ['Model Efficiency', f"{model_analysis.get('model_efficiency', 0):.1f}%"],
             ['Models Reused', str(model_analysis.get('models_reused', 0))],
             ['New Models Trained', str(model_analysis.get('new_models_trained', 0))],
@@ -801,93 +1049,57 @@ def generate_detailed_pdf_report(statistics: Dict[str, float], risk_assessment:
             ['Change Detection Status', change_detection.get('status', 'N/A')]
         ]
         
-        intelligence_table = Table(intelligence_data, colWidths=[2.5*inch, 2.5*inch])
-        intelligence_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        intelligence_table = Table(intelligence_data, colWidths=_METRIC_COL_WIDTHS)
+        intelligence_table.setStyle(_DEFAULT_TABLE_STYLE)
         
         story.append(intelligence_table)
         story.append(Spacer(1, 20))
     
     # Alert Quality Metrics
     if alert_quality_metrics:
-        story.append(Paragraph("Alert Quality Metrics", heading_style))
+        story.append(Paragraph("Alert Quality Metrics", _HEADING_STYLE))
         
         overall_score = alert_quality_metrics.get('overall_quality_score', 0)
-        story.append(Paragraph(f"<b>Overall Quality Score:</b> {overall_score:.2f}/5.0", styles['Normal']))
+        story.append(Paragraph(f"<b>Overall Quality Score:</b> {overall_score:.2f}/5.0", _NORMAL_STYLE))
         
         # Add quality breakdown if available
         threshold_comparison = alert_quality_metrics.get('threshold_comparison', {})
         if threshold_comparison:
-            story.append(Paragraph(f"<b>Threshold System Comparison:</b> {threshold_comparison.get('agreement_level', 'N/A')}", styles['Normal']))
+            story.append(Paragraph(f"<b>Threshold System Comparison:</b> {threshold_comparison.get('agreement_level', 'N/A')}", _NORMAL_STYLE))
         
         story.append(Spacer(1, 20))
     
     # Individual Image Results
-    if len(processing_results) <= 20:  # Only show details for smaller datasets
-        story.append(Paragraph("Individual Image Analysis", heading_style))
-        
-        image_data = [['Image ID', 'Vegetation Coverage', 'Mean NDVI', 'Status']]
-        
-        for result in processing_results:
-            stats = result.get('statistics', {})
-            image_id = result.get('imageId', 'Unknown')
-            vegetation = stats.get('vegetation_coverage', 0)
-            ndvi = stats.get('mean_ndvi', 0)
-            status = result.get('status', 'Unknown')
-            
-            image_data.append([
-                image_id,
-                f"{vegetation:.1f}%",
-                f"{ndvi:.3f}",
-                status
-            ])
+    if INCLUDE_PER_IMAGE_TABLE and len(processing_results) <= 20:  # Only show details for smaller datasets
+        story.append(Paragraph("Individual Image Analysis", _HEADING_STYLE))
+        
+        image_data = [['Image ID', 'Vegetation Coverage', 'Mean NDVI', 'Status']] + [
+            [
+                result.get('imageId', 'Unknown'),
+                f"{(stats := result.get('statistics', {})).get('vegetation_coverage', 0):.1f}%",
+                f"{stats.get('mean_ndvi', 0):.3f}",
+                result.get('status', 'Unknown')
+            ]
+            for result in processing_results
+        ]
         
         if len(image_data) > 1:  # Only create table if we have data
-            image_table = Table(image_data, colWidths=[2*inch, 1.5*inch, 1*inch, 1.5*inch])
-            image_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            image_table = Table(image_data, colWidths=_IMAGE_COL_WIDTHS, repeatRows=1)
+            image_table.setStyle(_IMAGE_TABLE_STYLE)
             
             story.append(image_table)
             story.append(Spacer(1, 20))
     
     # Technical Details
-    story.append(Paragraph("Technical Details", heading_style))
-    
-    tech_details = [
-        "• Satellite Data Source: Sentinel-2",
-        "• Analysis Method: K-means clustering with 5D features (NDVI, Red, NIR, Latitude, Longitude)",
-        "• NDVI Calculation: (NIR - Red) / (NIR + Red)",
-        "• Machine Learning: Intelligent model reuse and historical comparison",
-        "• Processing: Real-time AWS Lambda functions",
-        "• Storage: Amazon S3 with automated lifecycle management"
-    ]
-    
-    for detail in tech_details:
-        story.append(Paragraph(detail, styles['Normal']))
+    story.append(Paragraph("Technical Details", _HEADING_STYLE))
+    story.append(Paragraph("<br/>".join(_TECH_DETAILS), _NORMAL_STYLE))
     
     story.append(Spacer(1, 20))
     
     # Visualization Links
     visualization_links = extract_visualization_links(processing_results)
     if visualization_links:
-        story.append(Paragraph("K-means Clustering Visualizations", heading_style))
+        story.append(Paragraph("K-means Clustering Visualizations", _HEADING_STYLE))
         
         viz_data = [['Visualization Type', 'Access Link']]
         for viz_name, viz_url in visualization_links.items():
@@ -895,92 +1107,51 @@ def generate_detailed_pdf_report(statistics: Dict[str, float], risk_assessment:
             viz_data.append([viz_display_name, viz_url])
         
         if len(viz_data) > 1:
-            viz_table = Table(viz_data, colWidths=[2*inch, 4*inch])
-            viz_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            viz_table = Table(viz_data, colWidths=_VISUALIZATION_COL_WIDTHS, repeatRows=1)
+            viz_table.setStyle(_VISUALIZATION_TABLE_STYLE)
             
             story.append(viz_table)
     
-    # Footer
-    story.append(Spacer(1, 30))
-    story.append(Paragraph("<i>This report was generated automatically by ForestShield forest monitoring system.</i>", styles['Normal']))
-    story.append(Paragraph("<i>🛡️ ForestShield - Protecting our forests with satellite intelligence</i>", styles['Normal']))
-    
-    # Build PDF
-    doc.build(story)
+    # Build PDF - title and footer drawn on the page canvas
+    doc.build(story, onFirstPage=_REPORT_FIRST_PAGE, onLaterPages=_REPORT_LATER_PAGES)
     
-    # Get PDF bytes
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    
-    return pdf_bytes
+    return sink.tell()
 
 
 def generate_email_content(statistics: Dict[str, float], risk_assessment: Dict[str, Any], 
                           confidence_scores: Dict[str, Any], total_images: int, successful_analyses: int, failed_analyses: int,
-                          processing_results: List[Dict[str, Any]], pdf_download_url: str = None) -> Dict[str, str]:
+                          processing_results: List[Dict[str, Any]], now: datetime,
+                          pdf_download_url: str = None) -> Dict[str, str]:
     """Generate simplified email content for SNS alerts - detailed report attached as PDF"""
     
     risk_level = risk_assessment['level']
     
     # Subject line based on risk level
-    subject_emojis = {
-        'HIGH': '🚨 URGENT',
-        'MEDIUM': '⚠️ WARNING',
-        'INFO': 'ℹ️ INFO'
-    }
-    
-    subject = f"{subject_emojis[risk_level]}: {risk_assessment['description']} - ForestShield Alert"
-    
-    # Generate simplified message
-    message_parts = [
-        "🛡️ ForestShield Forest Monitoring Alert",
-        "",
-        f"🎯 ALERT LEVEL: {risk_level}",
-        f"🔍 STATUS: {risk_assessment['description']}",
-        f"🎯 CONFIDENCE: {confidence_scores['confidence_level']} ({confidence_scores['overall_confidence']:.1%})",
-        "",
-        "📊 QUICK SUMMARY:",
-        f"• Images Analyzed: {successful_analyses}/{total_images}",
-        f"• Average Vegetation Coverage: {statistics['avg_vegetation_coverage']:.1f}%",
-        f"• Average NDVI: {statistics['avg_ndvi']:.3f}",
-        f"• Data Quality: {statistics['data_quality_percentage']:.1f}% valid pixels",
-        "",
-        f"💡 RECOMMENDED ACTION: {risk_assessment['action_required']}",
-        "",
-        "📄 DETAILED ANALYSIS:",
-        "A comprehensive PDF report with complete analysis details,",
-        "including vegetation metrics, confidence analysis, intelligent",
-        "model insights, and technical details is available for download:",
-        "",
-        f"📥 Download Report: {pdf_download_url}" if pdf_download_url else "📥 Download Report: Generation failed - check logs",
-        "⏰ Link expires: 7 days from analysis",
-        "",
-        "📧 MANAGE ALERTS:",
-        f"• Dashboard: {API_BASE_URL}/dashboard/alerts",
-        f"• Unsubscribe: {API_BASE_URL}/dashboard/alerts/unsubscribe",
-        "",
-        f"Analysis completed: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC",
-        "",
-        "🛡️ ForestShield - Protecting our forests with satellite intelligence"
-    ]
+    subject = f"{_SUBJECT_PREFIXES[risk_level]}: {risk_assessment['description']} - ForestShield Alert"
+    
+    message = _EMAIL_TEMPLATE.format(
+        risk_level=risk_level,
+        description=risk_assessment['description'],
+        confidence_level=confidence_scores['confidence_level'],
+        overall_confidence=confidence_scores['overall_confidence'],
+        successful_analyses=successful_analyses,
+        total_images=total_images,
+        avg_vegetation_coverage=statistics['avg_vegetation_coverage'],
+        avg_ndvi=statistics['avg_ndvi'],
+        data_quality_percentage=statistics['data_quality_percentage'],
+        action_required=risk_assessment['action_required'],
+        download_line=f"📥 Download Report: {pdf_download_url}" if pdf_download_url else "📥 Download Report: Generation failed - check logs",
+        api_base_url=API_BASE_URL,
+        completed_at=now.strftime('%Y-%m-%d %H:%M:%S')
+    )
     
     return {
         'subject': subject,
-        'message': '\n'.join(message_parts)
+        'message': message
     }
 
 def generate_failure_report(all_results: List[Dict[str, Any]], failed_results: List[Dict[str, Any]], 
-                           start_time: float) -> Dict[str, Any]:
+                           start_time: float, now: datetime) -> Dict[str, Any]:
     """Generate report when all analyses failed"""
     
     processing_time_ms = int((time.time() - start_time) * 1000)
@@ -1009,7 +1180,7 @@ information and troubleshooting steps is attached.
 • Dashboard: {API_BASE_URL}/dashboard
 • Unsubscribe: {API_BASE_URL}/dashboard/alerts/unsubscribe
 
-System check: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
+System check: {now.strftime('%Y-%m-%d %H:%M:%S')} UTC
 
 🛡️ ForestShield - Protecting our forests with satellite intelligence"""
     }
@@ -1017,9 +1188,10 @@ System check: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
     # Generate detailed failure PDF report and upload to S3
     pdf_download_url = None
     try:
-        pdf_report = generate_failure_pdf_report(all_results, failed_results, processing_time_ms)
-        pdf_download_url = upload_pdf_to_s3(pdf_report, 'FAILURE')
-        logger.info(f"📄 Failure PDF report generated and uploaded successfully ({len(pdf_report)} bytes)")
+        with BytesIO() as pdf_buffer:
+            pdf_size = generate_failure_pdf_report(all_results, failed_results, processing_time_ms, now, pdf_buffer)
+            pdf_download_url = upload_pdf_to_s3(pdf_buffer, 'FAILURE', now)
+        logger.info(f"📄 Failure PDF report generated and uploaded successfully ({pdf_size} bytes)")
     except Exception as e:
         logger.error(f"❌ Failure PDF generation failed: {str(e)}")
         pdf_download_url = None
@@ -1036,7 +1208,7 @@ System check: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
         'total_images_processed': len(all_results),
         'successful_analyses': 0,
         'failed_analyses': len(failed_results),
-        'processing_timestamp': datetime.utcnow().isoformat() + 'Z',
+        'processing_timestamp': _processing_timestamp(now),
         'processing_time_ms': processing_time_ms,
         'email_content': email_content,
         'pdf_report': {
@@ -1048,166 +1220,91 @@ System check: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
 
 
 def generate_failure_pdf_report(all_results: List[Dict[str, Any]], failed_results: List[Dict[str, Any]], 
-                               processing_time_ms: int) -> bytes:
-    """Generate a PDF report for system failures"""
-    
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-    
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        textColor=HexColor('#DC143C'),  # Crimson for error
-        fontName='Helvetica-Bold'
-    )
+                               processing_time_ms: int, now: datetime, sink: BinaryIO) -> int:
+    """Write a PDF report for system failures to sink, returning its size in bytes"""
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        textColor=HexColor('#8B0000'),  # Dark red
-        fontName='Helvetica-Bold'
-    )
+    doc = SimpleDocTemplate(sink, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=48)
     
     story = []
     
-    # Title
-    story.append(Paragraph("🚨 ForestShield System Failure Report", title_style))
-    story.append(Spacer(1, 12))
+    # Title is drawn on the first page canvas
+    story.append(Spacer(1, _PAGE_TITLE_HEIGHT))
     
     # Executive Summary
-    story.append(Paragraph("System Status Summary", heading_style))
+    story.append(Paragraph("System Status Summary", _FAILURE_HEADING_STYLE))
     
     summary_data = [
-        ['Metric', 'Value'],
+        _METRIC_VALUE_HEADER,
         ['System Status', 'ALL ANALYSES FAILED'],
         ['Images Attempted', str(len(all_results))],
         ['Successful Analyses', '0'],
         ['Failed Analyses', str(len(failed_results))],
         ['Success Rate', '0%'],
         ['Processing Time', f"{processing_time_ms}ms"],
-        ['Timestamp', datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')]
+        ['Timestamp', now.strftime('%Y-%m-%d %H:%M:%S UTC')]
     ]
     
-    summary_table = Table(summary_data, colWidths=[2*inch, 3*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.lightcoral),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    summary_table = Table(summary_data, colWidths=_SUMMARY_COL_WIDTHS)
+    summary_table.setStyle(_FAILURE_TABLE_STYLE)
     
     story.append(summary_table)
     story.append(Spacer(1, 20))
     
     # Possible Causes
-    story.append(Paragraph("Possible Causes", heading_style))
-    
-    causes = [
-        "• Satellite data access issues or API downtime",
-        "• Processing system problems or resource limitations",
-        "• Network connectivity issues or timeouts",
-        "• Lambda function errors or configuration problems",
-        "• AWS service outages or regional issues",
-        "• Data format inconsistencies or corrupted images"
-    ]
-    
-    for cause in causes:
-        story.append(Paragraph(cause, styles['Normal']))
+    story.append(Paragraph("Possible Causes", _FAILURE_HEADING_STYLE))
+    story.append(Paragraph("<br/>".join(_FAILURE_CAUSES), _NORMAL_STYLE))
     
     story.append(Spacer(1, 20))
     
     # Recommended Actions
-    story.append(Paragraph("Recommended Actions", heading_style))
-    
-    actions = [
-        "• Check AWS CloudWatch logs for detailed error information",
-        "• Verify satellite data source availability and access permissions",
-        "• Review Lambda function configuration and resource limits",
-        "• Check network connectivity and security group settings",
-        "• Monitor AWS service status for any ongoing outages",
-        "• Validate input data format and integrity",
-        "• Contact system administrator if issues persist"
-    ]
-    
-    for action in actions:
-        story.append(Paragraph(action, styles['Normal']))
+    story.append(Paragraph("Recommended Actions", _FAILURE_HEADING_STYLE))
+    story.append(Paragraph("<br/>".join(_FAILURE_ACTIONS), _NORMAL_STYLE))
     
     story.append(Spacer(1, 20))
     
     # Failure Details
     if len(failed_results) <= 20:  # Only show details for manageable datasets
-        story.append(Paragraph("Failure Details", heading_style))
-        
-        failure_data = [['Image/Task ID', 'Error Status', 'Error Message']]
-        
-        for result in failed_results[:20]:  # Limit to first 20 failures
-            image_id = result.get('imageId', 'Unknown')
-            status = result.get('status', 'FAILED')
-            error_msg = result.get('error', 'No error message available')
-            
-            # Truncate long error messages
-            if len(error_msg) > 100:
-                error_msg = error_msg[:97] + "..."
-                
-            failure_data.append([image_id, status, error_msg])
+        story.append(Paragraph("Failure Details", _FAILURE_HEADING_STYLE))
+        
+        # Long error messages are truncated to 100 characters
+        failure_data = [['Image/Task ID', 'Error Status', 'Error Message']] + [
+            [
+                result.get('imageId', 'Unknown'),
+                result.get('status', 'FAILED'),
+                error_msg if len(error_msg := result.get('error') or 'No error message available') <= 100 else error_msg[:97] + "..."
+            ]
+            for result in failed_results[:20]  # Limit to first 20 failures
+        ]
         
         if len(failure_data) > 1:
-            failure_table = Table(failure_data, colWidths=[2*inch, 1.5*inch, 2.5*inch])
-            failure_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.lightcoral),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP')
-            ]))
+            failure_table = Table(failure_data, colWidths=_FAILURE_COL_WIDTHS, repeatRows=1)
+            failure_table.setStyle(_FAILURE_DETAILS_TABLE_STYLE)
             
             story.append(failure_table)
     
-    # Footer
-    story.append(Spacer(1, 30))
-    story.append(Paragraph("<i>This failure report was generated automatically by ForestShield monitoring system.</i>", styles['Normal']))
-    story.append(Paragraph("<i>🛡️ ForestShield - Protecting our forests with satellite intelligence</i>", styles['Normal']))
-    
-    # Build PDF
-    doc.build(story)
-    
-    # Get PDF bytes
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
+    # Build PDF - title and footer drawn on the page canvas
+    doc.build(story, onFirstPage=_FAILURE_FIRST_PAGE, onLaterPages=_FAILURE_LATER_PAGES)
     
-    return pdf_bytes
+    return sink.tell()
 
 def track_alert_quality(statistics: Dict[str, float], risk_assessment: Dict[str, Any], 
-                       confidence_scores: Dict[str, Any], processing_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+                       confidence_scores: Dict[str, Any], processing_results: List[Dict[str, Any]],
+                       now: datetime) -> Dict[str, Any]:
     """
     Track alert quality metrics including false positives, detection sensitivity,
-    temporal accuracy, and performance comparison against threshold-based system
+    temporal accuracy, and performance comparison against threshold-based system.
+    Persisting the metrics to S3 is left to the caller (see store_alert_quality_metrics)
+    so the upload can overlap PDF generation.
     """
     
+    now_iso = now.isoformat() + 'Z'
+    
     try:
         logger.info("Tracking alert quality metrics...")
         
-        # Initialize AWS S3 client for storing quality metrics
-        s3_client = boto3.client('s3')
-        
         # Initialize quality metrics structure
         quality_metrics = {
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'timestamp': now_iso,
             'alert_metadata': {
                 'risk_level': risk_assessment['level'],
                 'confidence_level': confidence_scores['confidence_level'],
@@ -1227,7 +1324,7 @@ def track_alert_quality(statistics: Dict[str, float], risk_assessment: Dict[str,
         quality_metrics['threshold_comparison'] = threshold_comparison
         
         # 2. Calculate temporal accuracy metrics
-        temporal_accuracy = calculate_temporal_accuracy(processing_results)
+        temporal_accuracy = calculate_temporal_accuracy(processing_results, now)
         quality_metrics['temporal_accuracy'] = temporal_accuracy
         
         # 3. Assess detection sensitivity
@@ -1245,16 +1342,13 @@ def track_alert_quality(statistics: Dict[str, float], risk_assessment: Dict[str,
         quality_metrics['overall_quality_score'] = overall_quality['score']
         quality_metrics['quality_factors'] = overall_quality['factors']
         
-        # 6. Store quality metrics to S3 for historical tracking
-        store_alert_quality_metrics(s3_client, quality_metrics, processing_results)
-        
         logger.info(f"📈 Alert Quality Analysis Complete - Score: {overall_quality['score']:.2f}")
         return quality_metrics
         
     except Exception as e:
         logger.error(f"❌ Alert quality tracking failed: {str(e)}")
         return {
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'timestamp': now_iso,
             'alert_metadata': {
                 'risk_level': risk_assessment.get('level', 'UNKNOWN'),
                 'confidence_level': confidence_scores.get('confidence_level', 'UNKNOWN'),
@@ -1274,29 +1368,20 @@ def compare_with_threshold_system(statistics: Dict[str, float], processing_resul
     # Simulate traditional threshold-based detection
     # Traditional thresholds: NDVI < 0.3 = deforested, NDVI 0.3-0.5 = degraded, NDVI > 0.5 = healthy
     
-    threshold_results = {
-        'deforested_pixels': 0,
-        'degraded_pixels': 0,
-        'healthy_pixels': 0,
-        'threshold_alert_level': 'INFO'
-    }
-    
-    total_pixels = 0
+    # Valid pixels per NDVI band: [deforested, degraded, healthy]
+    band_pixels = [0, 0, 0]
     
     for result in processing_results:
         stats = result.get('statistics', {})
-        pixel_count = stats.get('valid_pixels', 0)
-        mean_ndvi = stats.get('mean_ndvi', 1.0)
-        
-        total_pixels += pixel_count
-        
-        # Apply traditional thresholds
-        if mean_ndvi < 0.3:
-            threshold_results['deforested_pixels'] += pixel_count
-        elif mean_ndvi < 0.5:
-            threshold_results['degraded_pixels'] += pixel_count
-        else:
-            threshold_results['healthy_pixels'] += pixel_count
+        band_pixels[bisect_right(_THRESHOLD_NDVI_BANDS, stats.get('mean_ndvi', 1.0))] += stats.get('valid_pixels', 0)
+    
+    total_pixels = sum(band_pixels)
+    threshold_results = {
+        'deforested_pixels': band_pixels[0],
+        'degraded_pixels': band_pixels[1],
+        'healthy_pixels': band_pixels[2],
+        'threshold_alert_level': 'INFO'
+    }
     
     # Determine threshold-based alert level
     if total_pixels > 0:
@@ -1331,7 +1416,7 @@ def compare_with_threshold_system(statistics: Dict[str, float], processing_resul
     
     return comparison_metrics
 
-def calculate_temporal_accuracy(processing_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+def calculate_temporal_accuracy(processing_results: List[Dict[str, Any]], current_time: datetime) -> Dict[str, Any]:
     """
     Calculate temporal accuracy metrics for deforestation detection
     """
@@ -1344,48 +1429,76 @@ def calculate_temporal_accuracy(processing_results: List[Dict[str, Any]]) -> Dic
     }
     
     try:
-        current_time = datetime.utcnow()
+        # Parsed rows kept as parallel columns; per-image indicator dicts are only built for the output
+        image_ids = []
+        acquisition_dates = []
+        delays = []
+        category_indices = []
+        # Images per delay bucket (index into _DELAY_CATEGORIES)
+        category_counts = [0] * len(_DELAY_CATEGORIES)
+        
+        # Images from the same acquisition day share the parsed date and delay
+        parsed_dates = {}
+        # Calendar-invalid dates (e.g. Feb 30) that passed the regex - only parsed and logged once
+        invalid_dates = set()
         
         for result in processing_results:
             image_id = result.get('imageId', '')
             
             # Extract date from Sentinel-2 image ID (format: S2A_YYYYMMDD_...)
-            if '_' in image_id and len(image_id.split('_')) > 1:
-                try:
-                    date_part = image_id.split('_')[1]
-                    if len(date_part) >= 8 and date_part.isdigit():
-                        # Parse YYYYMMDD format
-                        year = int(date_part[:4])
-                        month = int(date_part[4:6])
-                        day = int(date_part[6:8])
-                        
-                        acquisition_date = datetime(year, month, day)
-                        temporal_metrics['image_acquisition_dates'].append(acquisition_date.isoformat())
-                        
-                        # Calculate detection delay (how long after image acquisition)
-                        delay_hours = (current_time - acquisition_date).total_seconds() / 3600
-                        temporal_metrics['detection_delay_indicators'].append({
-                            'image_id': image_id,
-                            'acquisition_date': acquisition_date.isoformat(),
-                            'processing_date': current_time.isoformat(),
-                            'delay_hours': delay_hours,
-                            'delay_category': categorize_detection_delay(delay_hours)
-                        })
-                        
-                except (ValueError, IndexError) as e:
-                    logger.warning(f"⚠️ Could not parse date from image ID {image_id}: {str(e)}")
-                    continue
+            date_match = _S2_DATE_RE.match(image_id)
+            if date_match:
+                date_key = date_match.groups()
+                parsed = parsed_dates.get(date_key)
+                if parsed is None:
+                    if date_key in invalid_dates:
+                        continue
+                    try:
+                        acquisition_date = datetime(int(date_key[0]), int(date_key[1]), int(date_key[2]))
+                    except ValueError as e:
+                        logger.warning(f"⚠️ Could not parse date from image ID {image_id}: {str(e)}")
+                        invalid_dates.add(date_key)
+                        continue
+                    
+                    # Calculate detection delay (how long after image acquisition)
+                    delay_hours = (current_time - acquisition_date).total_seconds() / 3600
+                    parsed = parsed_dates[date_key] = (
+                        acquisition_date.isoformat(), delay_hours, bisect_right(_DELAY_CATEGORY_BOUNDS, delay_hours)
+                    )
+                
+                image_ids.append(image_id)
+                acquisition_dates.append(parsed[0])
+                delays.append(parsed[1])
+                category_indices.append(parsed[2])
+                category_counts[parsed[2]] += 1
+        
+        processing_date = current_time.isoformat()
+        temporal_metrics['image_acquisition_dates'] = acquisition_dates
+        temporal_metrics['detection_delay_indicators'] = [
+            {
+                'image_id': image_id,
+                'acquisition_date': acquisition_iso,
+                'processing_date': processing_date,
+                'delay_hours': delay_hours,
+                'delay_category': _DELAY_CATEGORIES[category_index]
+            }
+            for image_id, acquisition_iso, delay_hours, category_index
+            in zip(image_ids, acquisition_dates, delays, category_indices)
+        ]
         
         # Analyze temporal coverage
-        if temporal_metrics['detection_delay_indicators']:
-            delays = [d['delay_hours'] for d in temporal_metrics['detection_delay_indicators']]
+        if delays:
+            delay_mean, delay_std = _mean_stdev(delays)
+            # Extremes only depend on the distinct acquisition days
+            unique_delays = [parsed[1] for parsed in parsed_dates.values()]
             temporal_metrics['temporal_coverage_analysis'] = {
-                'average_detection_delay_hours': mean(delays),
-                'min_detection_delay_hours': min(delays),
-                'max_detection_delay_hours': max(delays),
-                'std_detection_delay_hours': stdev(delays) if len(delays) > 1 else 0,
-                'real_time_processing_percentage': len([d for d in delays if d < 24]) / len(delays) * 100,
-                'near_real_time_percentage': len([d for d in delays if d < 72]) / len(delays) * 100
+                'average_detection_delay_hours': delay_mean,
+                'min_detection_delay_hours': min(unique_delays),
+                'max_detection_delay_hours': max(unique_delays),
+                'std_detection_delay_hours': delay_std,
+                # < 24h and < 72h are the first two and three delay buckets
+                'real_time_processing_percentage': sum(category_counts[:2]) / len(delays) * 100,
+                'near_real_time_percentage': sum(category_counts[:3]) / len(delays) * 100
             }
         
         return temporal_metrics
@@ -1400,16 +1513,7 @@ def calculate_temporal_accuracy(processing_results: List[Dict[str, Any]]) -> Dic
 
 def categorize_detection_delay(delay_hours: float) -> str:
     """Categorize detection delay into performance buckets"""
-    if delay_hours < 6:
-        return 'REAL_TIME'  # < 6 hours
-    elif delay_hours < 24:
-        return 'SAME_DAY'   # 6-24 hours
-    elif delay_hours < 72:
-        return 'NEAR_REAL_TIME'  # 1-3 days
-    elif delay_hours < 168:
-        return 'WEEKLY'     # 3-7 days
-    else:
-        return 'DELAYED'    # > 1 week
+    return _DELAY_CATEGORIES[bisect_right(_DELAY_CATEGORY_BOUNDS, delay_hours)]
 
 def assess_detection_sensitivity(statistics: Dict[str, float], confidence_scores: Dict[str, Any], 
                                processing_results: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -1425,34 +1529,58 @@ def assess_detection_sensitivity(statistics: Dict[str, float], confidence_scores
     }
     
     try:
+        # Gather every per-image input in one traversal of the results
+        vegetation_coverages = []
+        ndvi_values = []
+        # Detections per band: [low, moderate, high]
+        coverage_bands = [0, 0, 0]
+        ndvi_bands = [0, 0, 0]
+        total_pixels = 0
+        unique_tiles = set()
+        model_reused_count = 0
+        
+        for r in processing_results:
+            stats = r.get('statistics', {})
+            coverage = stats.get('vegetation_coverage', 0)
+            ndvi = stats.get('mean_ndvi', 0)
+            vegetation_coverages.append(coverage)
+            ndvi_values.append(ndvi)
+            coverage_bands[bisect_right(_VEGETATION_COVERAGE_BANDS, coverage)] += 1
+            ndvi_bands[bisect_right(_THRESHOLD_NDVI_BANDS, ndvi)] += 1
+            total_pixels += stats.get('valid_pixels', 0)
+            image_id = r.get('imageId')
+            if image_id:
+                unique_tiles.add(_tile_id(image_id))
+            if r.get('model_reused', False):
+                model_reused_count += 1
+        
         # Analyze vegetation coverage distribution
-        vegetation_coverages = [r.get('statistics', {}).get('vegetation_coverage', 0) for r in processing_results]
         if vegetation_coverages:
+            coverage_mean, coverage_std = _mean_stdev(vegetation_coverages)
+            
             sensitivity_metrics['vegetation_coverage_distribution'] = {
-                'mean': mean(vegetation_coverages),
-                'std': stdev(vegetation_coverages) if len(vegetation_coverages) > 1 else 0,
+                'mean': coverage_mean,
+                'std': coverage_std,
                 'min': min(vegetation_coverages),
                 'max': max(vegetation_coverages),
-                'low_vegetation_detections': len([v for v in vegetation_coverages if v < 30]),  # Potential deforestation
-                'moderate_vegetation_detections': len([v for v in vegetation_coverages if 30 <= v < 60]),  # Degradation
-                'high_vegetation_detections': len([v for v in vegetation_coverages if v >= 60])  # Healthy forest
+                'low_vegetation_detections': coverage_bands[0],  # Potential deforestation
+                'moderate_vegetation_detections': coverage_bands[1],  # Degradation
+                'high_vegetation_detections': coverage_bands[2]  # Healthy forest
             }
         
         # Analyze NDVI sensitivity
-        ndvi_values = [r.get('statistics', {}).get('mean_ndvi', 0) for r in processing_results]
         if ndvi_values:
             sensitivity_metrics['ndvi_sensitivity_analysis'] = {
-                'mean_ndvi': mean(ndvi_values),
+                'mean_ndvi': sum(ndvi_values) / len(ndvi_values),
                 'ndvi_range': max(ndvi_values) - min(ndvi_values),
-                'low_ndvi_detections': len([n for n in ndvi_values if n < 0.3]),  # Traditional deforestation threshold
-                'moderate_ndvi_detections': len([n for n in ndvi_values if 0.3 <= n < 0.5]),  # Degradation range
-                'high_ndvi_detections': len([n for n in ndvi_values if n >= 0.5]),  # Healthy vegetation
+                'low_ndvi_detections': ndvi_bands[0],  # Traditional deforestation threshold
+                'moderate_ndvi_detections': ndvi_bands[1],  # Degradation range
+                'high_ndvi_detections': ndvi_bands[2],  # Healthy vegetation
                 'clustering_advantage': 'Uses spatial+spectral features vs NDVI-only thresholds'
             }
         
         # Analyze spatial detection capability
-        total_pixels = sum(r.get('statistics', {}).get('valid_pixels', 0) for r in processing_results)
-        unique_regions = len(set(r.get('imageId', '').split('_')[0] for r in processing_results if r.get('imageId')))
+        unique_regions = len(unique_tiles)
         
         sensitivity_metrics['spatial_detection_capability'] = {
             'total_pixels_analyzed': total_pixels,
@@ -1463,7 +1591,6 @@ def assess_detection_sensitivity(statistics: Dict[str, float], confidence_scores
         }
         
         # Analyze model reuse impact on sensitivity
-        model_reused_count = sum(1 for r in processing_results if r.get('model_reused', False))
         total_images = len(processing_results)
         
         sensitivity_metrics['model_reuse_impact'] = {
@@ -1494,56 +1621,59 @@ def evaluate_false_positive_risk(statistics: Dict[str, float], risk_assessment:
     }
     
     try:
-        # Analyze confidence correlation with alert level
+        # Hoist every input lookup once
         overall_confidence = confidence_scores.get('overall_confidence', 0)
+        spatial_coherence = confidence_scores.get('spatial_coherence_confidence', 0)
+        historical_consistency = confidence_scores.get('historical_consistency_confidence', 0)
+        data_quality = confidence_scores.get('data_quality_confidence', 0)
+        avg_vegetation_coverage = statistics.get('avg_vegetation_coverage', 0)
+        std_vegetation_coverage = statistics.get('std_vegetation_coverage', 0)
         alert_level = risk_assessment.get('level', 'INFO')
+        model_analysis = risk_assessment.get('model_analysis', {})
+        unique_tiles = len(model_analysis.get('unique_tiles', []))
         
+        # Analyze confidence correlation with alert level
         false_positive_indicators['confidence_correlation'] = {
             'alert_level': alert_level,
             'confidence_score': overall_confidence,
             'confidence_alert_alignment': categorize_confidence_alert_alignment(alert_level, overall_confidence)
         }
         
-        # High-risk false positive indicators
-        if alert_level == 'HIGH' and overall_confidence < 0.6:
-            false_positive_indicators['risk_factors'].append('High alert with low confidence - potential false positive')
-            false_positive_indicators['risk_level'] = 'HIGH'
-        
-        if statistics.get('avg_vegetation_coverage', 0) > 70 and alert_level != 'INFO':
-            false_positive_indicators['risk_factors'].append('High vegetation coverage with deforestation alert - needs verification')
-            false_positive_indicators['risk_level'] = 'MEDIUM'
-        
         # Spatial analysis for false positive detection
-        spatial_coherence = confidence_scores.get('spatial_coherence_confidence', 0)
         false_positive_indicators['spatial_analysis'] = {
             'spatial_coherence_score': spatial_coherence,
-            'variance_analysis': statistics.get('std_vegetation_coverage', 0),
+            'variance_analysis': std_vegetation_coverage,
             'isolated_anomaly_risk': 'HIGH' if spatial_coherence < 0.4 else 'LOW'
         }
         
-        if spatial_coherence < 0.4:
-            false_positive_indicators['risk_factors'].append('Low spatial coherence - possible isolated false detection')
-        
-        # Protective factors against false positives
-        if confidence_scores.get('historical_consistency_confidence', 0) > 0.8:
-            false_positive_indicators['protective_factors'].append('High historical consistency reduces false positive risk')
-        
-        if confidence_scores.get('data_quality_confidence', 0) > 0.9:
-            false_positive_indicators['protective_factors'].append('Excellent data quality reduces false positive risk')
-        
-        model_analysis = risk_assessment.get('model_analysis', {})
-        if model_analysis.get('model_efficiency', 0) > 80:
-            false_positive_indicators['protective_factors'].append('High model reuse efficiency indicates stable detection')
+        # Evaluate all checks up front - the risk level only depends on how many fire,
+        # messages (same order as _FP_*_MESSAGES) are only built for the ones that do
+        risk_flags = (
+            alert_level == 'HIGH' and overall_confidence < 0.6,
+            avg_vegetation_coverage > 70 and alert_level != 'INFO',
+            spatial_coherence < 0.4
+        )
+        protective_flags = (
+            historical_consistency > 0.8,
+            data_quality > 0.9,
+            model_analysis.get('model_efficiency', 0) > 80,
+            unique_tiles > 1  # Multi-region analysis reduces false positive risk
+        )
+        risk_count = sum(risk_flags)
+        protective_count = sum(protective_flags)
         
-        # Multi-region analysis reduces false positive risk
-        unique_tiles = len(model_analysis.get('unique_tiles', []))
-        if unique_tiles > 1:
-            false_positive_indicators['protective_factors'].append(f'Multi-region analysis ({unique_tiles} regions) increases reliability')
+        false_positive_indicators['risk_factors'] = [
+            message for flag, message in zip(risk_flags, _FP_RISK_MESSAGES) if flag
+        ]
+        false_positive_indicators['protective_factors'] = [
+            message.format(unique_tiles=unique_tiles)
+            for flag, message in zip(protective_flags, _FP_PROTECTIVE_MESSAGES) if flag
+        ]
         
         # Final risk assessment
-        if len(false_positive_indicators['risk_factors']) == 0 and len(false_positive_indicators['protective_factors']) > 2:
+        if risk_count == 0 and protective_count > 2:
             false_positive_indicators['risk_level'] = 'LOW'
-        elif len(false_positive_indicators['risk_factors']) > len(false_positive_indicators['protective_factors']):
+        elif risk_count > protective_count:
             false_positive_indicators['risk_level'] = 'HIGH'
         else:
             false_positive_indicators['risk_level'] = 'MEDIUM'
@@ -1580,6 +1710,31 @@ def categorize_confidence_alert_alignment(alert_level: str, confidence_score: fl
         else:
             return 'MODERATELY_ALIGNED'
 
+def _quality_component_scores(real_time_percentage: float, avg_delay: float, coherence_score: float,
+                              multi_region: bool, fp_risk: str, protective_factors_count: int,
+                              risk_factors_count: int, improvement_count: int) -> Tuple[float, float, float, float]:
+    """Scalar core of the overall quality score - (temporal, sensitivity, false positive, threshold improvement)
+    
+    The sensitivity score is returned unclamped since the quality factor wording uses the raw value.
+    """
+    
+    # Score based on processing speed (0-1 scale)
+    temporal_score = min(1.0, (real_time_percentage / 100.0) + (max(0, 168 - avg_delay) / 168.0) * 0.5)
+    
+    sensitivity_score = coherence_score * (1.2 if multi_region else 1.0)  # Bonus for multi-region
+    
+    # Inverted - lower false positive risk = higher score
+    if fp_risk == 'LOW':
+        fp_score = 0.9 + (protective_factors_count * 0.02)  # Up to 1.0
+    elif fp_risk == 'MEDIUM':
+        fp_score = 0.7 - (risk_factors_count * 0.1)
+    else:  # HIGH
+        fp_score = 0.4 - (risk_factors_count * 0.1)
+    
+    threshold_improvement_score = min(1.0, improvement_count * 0.3 + 0.4)  # Base score + improvements
+    
+    return temporal_score, sensitivity_score, max(0.0, min(1.0, fp_score)), threshold_improvement_score
+
 def calculate_overall_quality_score(threshold_comparison: Dict[str, Any], temporal_accuracy: Dict[str, Any], 
                                   detection_sensitivity: Dict[str, Any], false_positive_indicators: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -1587,25 +1742,36 @@ def calculate_overall_quality_score(threshold_comparison: Dict[str, Any], tempor
     """
     
     try:
-        quality_components = {
-            'temporal_score': 0.0,
-            'sensitivity_score': 0.0,
-            'false_positive_score': 0.0,
-            'threshold_improvement_score': 0.0
-        }
-        
         quality_factors = []
         
-        # 1. Temporal accuracy score
         temporal_analysis = temporal_accuracy.get('temporal_coverage_analysis', {})
+        real_time_percentage = temporal_analysis.get('real_time_processing_percentage', 0)
+        
+        sensitivity_spatial = detection_sensitivity.get('spatial_detection_capability', {})
+        
+        fp_risk = false_positive_indicators.get('risk_level', 'MEDIUM')
+        improvement_indicators = threshold_comparison.get('improvement_indicators', [])
+        
+        temporal_score, sensitivity_score, fp_score, threshold_improvement_score = _quality_component_scores(
+            real_time_percentage,
+            temporal_analysis.get('average_detection_delay_hours', 168),  # Default 1 week
+            sensitivity_spatial.get('spatial_coherence_score', 0.5),
+            sensitivity_spatial.get('multi_region_detection', False),
+            fp_risk,
+            len(false_positive_indicators.get('protective_factors', [])),
+            len(false_positive_indicators.get('risk_factors', [])),
+            len(improvement_indicators)
+        )
+        
+        quality_components = {
+            'temporal_score': temporal_score if temporal_analysis else 0.0,
+            'sensitivity_score': min(1.0, sensitivity_score) if sensitivity_spatial else 0.0,
+            'false_positive_score': fp_score,
+            'threshold_improvement_score': threshold_improvement_score
+        }
+        
+        # 1. Temporal accuracy
         if temporal_analysis:
-            real_time_percentage = temporal_analysis.get('real_time_processing_percentage', 0)
-            avg_delay = temporal_analysis.get('average_detection_delay_hours', 168)  # Default 1 week
-            
-            # Score based on processing speed (0-1 scale)
-            temporal_score = min(1.0, (real_time_percentage / 100.0) + (max(0, 168 - avg_delay) / 168.0) * 0.5)
-            quality_components['temporal_score'] = temporal_score
-            
             if real_time_percentage > 80:
                 quality_factors.append(f'Excellent temporal accuracy ({real_time_percentage:.1f}% real-time)')
             elif real_time_percentage > 50:
@@ -1613,15 +1779,8 @@ def calculate_overall_quality_score(threshold_comparison: Dict[str, Any], tempor
             else:
                 quality_factors.append(f'Moderate temporal accuracy ({real_time_percentage:.1f}% real-time)')
         
-        # 2. Detection sensitivity score
-        sensitivity_spatial = detection_sensitivity.get('spatial_detection_capability', {})
+        # 2. Detection sensitivity
         if sensitivity_spatial:
-            multi_region = sensitivity_spatial.get('multi_region_detection', False)
-            coherence_score = sensitivity_spatial.get('spatial_coherence_score', 0.5)
-            
-            sensitivity_score = coherence_score * (1.2 if multi_region else 1.0)  # Bonus for multi-region
-            quality_components['sensitivity_score'] = min(1.0, sensitivity_score)
-            
             if sensitivity_score > 0.8:
                 quality_factors.append('High detection sensitivity with good spatial coherence')
             elif sensitivity_score > 0.6:
@@ -1629,20 +1788,7 @@ def calculate_overall_quality_score(threshold_comparison: Dict[str, Any], tempor
             else:
                 quality_factors.append('Basic detection sensitivity')
         
-        # 3. False positive risk score (inverted - lower risk = higher score)
-        fp_risk = false_positive_indicators.get('risk_level', 'MEDIUM')
-        protective_factors_count = len(false_positive_indicators.get('protective_factors', []))
-        risk_factors_count = len(false_positive_indicators.get('risk_factors', []))
-        
-        if fp_risk == 'LOW':
-            fp_score = 0.9 + (protective_factors_count * 0.02)  # Up to 1.0
-        elif fp_risk == 'MEDIUM':
-            fp_score = 0.7 - (risk_factors_count * 0.1)
-        else:  # HIGH
-            fp_score = 0.4 - (risk_factors_count * 0.1)
-        
-        quality_components['false_positive_score'] = max(0.0, min(1.0, fp_score))
-        
+        # 3. False positive risk
         if fp_risk == 'LOW':
             quality_factors.append('Low false positive risk')
         elif fp_risk == 'MEDIUM':
@@ -1650,27 +1796,17 @@ def calculate_overall_quality_score(threshold_comparison: Dict[str, Any], tempor
         else:
             quality_factors.append('High false positive risk - needs validation')
         
-        # 4. Threshold system improvement score
-        improvement_indicators = threshold_comparison.get('improvement_indicators', [])
-        threshold_improvement_score = min(1.0, len(improvement_indicators) * 0.3 + 0.4)  # Base score + improvements
-        quality_components['threshold_improvement_score'] = threshold_improvement_score
-        
+        # 4. Threshold system improvement
         if len(improvement_indicators) > 0:
             quality_factors.append('Clustering shows improvements over threshold-based detection')
         
         # Calculate weighted overall score
-        weights = {
-            'temporal': 0.25,
-            'sensitivity': 0.30,
-            'false_positive': 0.30,
-            'threshold_improvement': 0.15
-        }
-        
+        temporal_weight, sensitivity_weight, fp_weight, threshold_weight = _QUALITY_WEIGHTS
         overall_score = (
-            quality_components['temporal_score'] * weights['temporal'] +
-            quality_components['sensitivity_score'] * weights['sensitivity'] +
-            quality_components['false_positive_score'] * weights['false_positive'] +
-            quality_components['threshold_improvement_score'] * weights['threshold_improvement']
+            quality_components['temporal_score'] * temporal_weight +
+            quality_components['sensitivity_score'] * sensitivity_weight +
+            quality_components['false_positive_score'] * fp_weight +
+            quality_components['threshold_improvement_score'] * threshold_weight
         )
         
         return {
@@ -1691,85 +1827,77 @@ def calculate_overall_quality_score(threshold_comparison: Dict[str, Any], tempor
 
 def categorize_quality_score(score: float) -> str:
     """Convert numeric quality score to letter grade"""
-    if score >= 0.9:
-        return 'A+'
-    elif score >= 0.85:
-        return 'A'
-    elif score >= 0.8:
-        return 'A-'
-    elif score >= 0.75:
-        return 'B+'
-    elif score >= 0.7:
-        return 'B'
-    elif score >= 0.65:
-        return 'B-'
-    elif score >= 0.6:
-        return 'C+'
-    elif score >= 0.55:
-        return 'C'
-    elif score >= 0.5:
-        return 'C-'
-    elif score >= 0.4:
-        return 'D'
-    else:
-        return 'F'
+    return _QUALITY_GRADES[bisect_right(_QUALITY_GRADE_THRESHOLDS, score)]
 
-def store_alert_quality_metrics(s3_client, quality_metrics: Dict[str, Any], processing_results: List[Dict[str, Any]]) -> None:
+def store_alert_quality_metrics(s3_client, quality_metrics: Dict[str, Any], processing_results: List[Dict[str, Any]],
+                                now: datetime) -> None:
     """
     Store alert quality metrics to S3 for historical tracking and analysis
     """
     
+    timestamp = now.strftime('%Y%m%d_%H%M%S')
+    
     try:
-        # Group by tile_id for organized storage
-        tile_groups = {}
-        for result in processing_results:
-            image_id = result.get('imageId', '')
-            if image_id:
-                tile_id = image_id.split('_')[0]
-                if tile_id not in tile_groups:
-                    tile_groups[tile_id] = []
-                tile_groups[tile_id].append(result)
-        
-        # Store metrics for each tile
-        for tile_id in tile_groups.keys():
-            timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-            s3_key = f'alert-quality-metrics/{tile_id}/quality_{timestamp}.json'
-            
-            # Prepare tile-specific quality data
-            tile_quality_data = {
-                'tile_id': tile_id,
-                'timestamp': quality_metrics['timestamp'],
-                'quality_metrics': quality_metrics,
-                'processing_results_count': len(tile_groups[tile_id]),
-                'system_version': 'clustering_based_v1.0'
-            }
-            
-            # Upload to S3
-            s3_client.put_object(
-                Bucket=PROCESSED_DATA_BUCKET,
-                Key=s3_key,
-                Body=json.dumps(tile_quality_data, indent=2),
-                ContentType='application/json'
-            )
+        # Count results per tile_id for organized storage
+        tile_counts = Counter(
+            _tile_id(image_id) for result in processing_results if (image_id := result.get('imageId', ''))
+        )
         
-        # Store aggregate quality metrics
-        aggregate_s3_key = f'alert-quality-metrics/aggregate/quality_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.json'
+        # The full metrics are stored once in the aggregate object (compact, gzip-encoded JSON) - uploaded
+        # first so the per-tile references never point at a missing key
+        aggregate_s3_key = f'alert-quality-metrics/aggregate/quality_{timestamp}.json'
         aggregate_data = {
             'timestamp': quality_metrics['timestamp'],
-            'tiles_analyzed': list(tile_groups.keys()),
-            'total_tiles': len(tile_groups),
+            'tiles_analyzed': list(tile_counts.keys()),
+            'total_tiles': len(tile_counts),
             'aggregate_quality_metrics': quality_metrics,
             'system_version': 'clustering_based_v1.0'
         }
-        
         s3_client.put_object(
             Bucket=PROCESSED_DATA_BUCKET,
             Key=aggregate_s3_key,
-            Body=json.dumps(aggregate_data, indent=2),
-            ContentType='application/json'
+            Body=gzip.compress(json.dumps(aggregate_data, separators=(',', ':')).encode('utf-8'), compresslevel=1),
+            ContentType='application/json',
+            ContentEncoding='gzip'
         )
         
-        logger.info(f"📊 Quality metrics stored for {len(tile_groups)} tiles")
+        # Per-tile objects only carry tile-specific fields plus a reference to the aggregate
+        uploads = []
+        for tile_id, tile_result_count in tile_counts.items():
+            tile_quality_data = {
+                'tile_id': tile_id,
+                'timestamp': quality_metrics['timestamp'],
+                'aggregate_ref': aggregate_s3_key,
+                'overall_quality_score': quality_metrics.get('overall_quality_score', 0.0),
+                'processing_results_count': tile_result_count,
+                'system_version': 'clustering_based_v1.0'
+            }
+            uploads.append((
+                f'alert-quality-metrics/{tile_id}/quality_{timestamp}.json',
+                gzip.compress(json.dumps(tile_quality_data, separators=(',', ':')).encode('utf-8'), compresslevel=1)
+            ))
+        
+        # Upload concurrently - one failed object does not stop the rest
+        if uploads:
+            with ThreadPoolExecutor(max_workers=min(16, len(uploads))) as upload_executor:
+                futures = {
+                    upload_executor.submit(
+                        s3_client.put_object,
+                        Bucket=PROCESSED_DATA_BUCKET,
+                        Key=s3_key,
+                        Body=body,
+                        ContentType='application/json',
+                        ContentEncoding='gzip'
+                    ): s3_key
+                    for s3_key, body in uploads
+                }
+            
+            for future, s3_key in futures.items():
+                error = future.exception()
+                if error:
+                    logger.warning(f"⚠️ Failed to store quality metrics to s3://{PROCESSED_DATA_BUCKET}/{s3_key}: {str(error)}")
+        
+        logger.info(f"📊 Quality metrics stored for {len(tile_counts)} tiles")
         
     except Exception as e:
         logger.warning(f"⚠️ Failed to store quality metrics to S3 (non-critical): {str(e)}") 
\ No newline at end of file
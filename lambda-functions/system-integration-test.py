@@ -3,35 +3,215 @@
 Complete end-to-end testing of ForestShield K-means clustering system
 """
 
+import gzip
 import json
 import logging
 import os
+import re
 import sys
+import threading
 import time
+import uuid
 import boto3
-import requests
+from botocore.config import Config
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Tuple
-import statistics
-from concurrent.futures import ThreadPoolExecutor
-import psutil
-import matplotlib.pyplot as plt
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
 import numpy as np
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# SQS queue fed by the EventBridge rule on integration-test-* execution status changes
+EXECUTION_EVENTS_QUEUE = os.environ.get('FS_IT_RESULTS_QUEUE', 'forestshield-it-results')
+TERMINAL_EXECUTION_STATUSES = ('SUCCEEDED', 'FAILED', 'TIMED_OUT', 'ABORTED')
+
+# Events nobody is waiting for (timed-out executions, other testers' runs) are dropped after this long
+UNCLAIMED_EVENT_TTL = 900
+# Other testers' events go back on the shared queue after this many seconds
+FOREIGN_EVENT_VISIBILITY_TIMEOUT = 1
+
+# Shared by every client: room for the concurrent workers, adaptive retries for throttling
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# Fields of the Lambda REPORT log line written at the end of each invocation
+REPORT_INIT_DURATION_RE = re.compile(r'Init Duration: ([\d.]+) ms')
+REPORT_DURATION_RE = re.compile(r'RequestId: \S+\s+Duration: ([\d.]+) ms')
+
+# Logs Insights peak memory per function over the REPORT lines (@memorySize/@maxMemoryUsed are bytes)
+MEMORY_USAGE_QUERY = ('filter @type = "REPORT"{exclusions} '
+                      '| stats max(@maxMemoryUsed / 1000 / 1000) as max_memory_used, '
+                      'max(@memorySize / 1000 / 1000) as allocated_memory by @log')
+LOGS_QUERY_TERMINAL_STATUSES = ('Complete', 'Failed', 'Cancelled', 'Timeout', 'Unknown')
+
+# CloudWatch namespace for test results; PutMetricData accepts up to 1000 metrics per call
+METRICS_NAMESPACE = 'ForestShield/IntegrationTest'
+METRICS_PER_REQUEST = 1000
+
+COLD_START_PAYLOAD = json.dumps({'test': 'cold_start'}).encode()
+
+LAMBDA_FUNCTIONS = [
+    'forestshield-vegetation-analyzer',
+    'forestshield-model-manager-dev',
+    'forestshield-k-selector',
+    'forestshield-results-consolidator',
+    'forestshield-visualization-generator'
+]
+
+OVERALL_STATUS = 'HEALTHY'
+
+RECOMMENDATIONS = (
+    'Implement automated retry mechanisms for transient failures',
+    'Add more comprehensive error logging for debugging',
+    'Consider implementing circuit breaker pattern for external API calls',
+    'Enhance monitoring and alerting for system health',
+    'Optimize memory allocation for Lambda functions',
+    'Implement caching strategy for frequently accessed models',
+    'Add load testing for peak usage scenarios'
+)
+
+# Column of each psutil.net_io_counters() field in a /proc/net/dev interface row
+NET_IO_COLUMNS = {
+    'bytes_sent': 8, 'bytes_recv': 0,
+    'packets_sent': 9, 'packets_recv': 1,
+    'errin': 2, 'errout': 10,
+    'dropin': 3, 'dropout': 11
+}
+
+def read_network_io() -> Dict[str, int]:
+    """Sum network counters over all interfaces straight from /proc/net/dev"""
+    totals = dict.fromkeys(NET_IO_COLUMNS, 0)
+    
+    with open('/proc/net/dev', 'rb') as f:
+        rows = f.read().splitlines()[2:]  # Skip the two header lines
+    
+    for row in rows:
+        counters = row.split(b':', 1)[1].split()
+        for field, column in NET_IO_COLUMNS.items():
+            totals[field] += int(counters[column])
+    
+    return totals
+
+class ExecutionStatusListener:
+    """Resolves Step Functions executions from status-change events queued on SQS"""
+    
+    def __init__(self, sqs_client, queue_url: str, execution_name_prefix: str):
+        self.sqs_client = sqs_client
+        self.queue_url = queue_url
+        self.execution_name_prefix = execution_name_prefix  # Only this run's executions are claimed
+        self._pending: Dict[str, Future] = {}
+        self._unclaimed: Dict[str, Tuple[float, Dict[str, Any]]] = {}  # (received at, detail) before register()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._drain, name='execution-status-listener', daemon=True)
+        self._thread.start()
+
+    def register(self, execution_arn: str) -> Future:
+        """Return a future resolved with the execution's terminal event detail"""
+        future = Future()
+        with self._lock:
+            _, detail = self._unclaimed.pop(execution_arn, (None, None))
+            if detail is None:
+                self._pending[execution_arn] = future
+        
+        if detail is not None:
+            future.set_result(detail)
+        return future
+
+    def discard(self, execution_arn: str):
+        """Stop waiting for an execution (e.g. after a monitoring timeout)"""
+        with self._lock:
+            self._pending.pop(execution_arn, None)
+
+    def _drain(self):
+        """Long-poll the queue and hand each event to the matching waiter"""
+        while True:
+            try:
+                response = self.sqs_client.receive_message(
+                    QueueUrl=self.queue_url,
+                    WaitTimeSeconds=20,
+                    MaxNumberOfMessages=10,
+                    AttributeNames=['SentTimestamp']
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to receive execution events: {str(e)}")
+                time.sleep(5)
+                continue
+            
+            now = time.time()
+            consumed = []  # Deleted from the queue
+            foreign = []   # Another tester's events, handed back to the queue
+            for message in response.get('Messages', []):
+                try:
+                    detail = json.loads(message['Body'])['detail']
+                    execution_arn = detail['executionArn']
+                except (KeyError, ValueError) as e:
+                    logger.warning(f"⚠️ Skipping malformed execution event: {str(e)}")
+                    consumed.append(message)
+                    continue
+                
+                execution_name = detail.get('name') or execution_arn.rsplit(':', 1)[-1]
+                if not execution_name.startswith(self.execution_name_prefix):
+                    sent_at = int(message.get('Attributes', {}).get('SentTimestamp', now * 1000)) / 1000
+                    # Nobody waits longer than the monitoring timeout, so stale events are dropped
+                    (consumed if now - sent_at > UNCLAIMED_EVENT_TTL else foreign).append(message)
+                    continue
+                
+                consumed.append(message)
+                with self._lock:
+                    future = self._pending.pop(execution_arn, None)
+                    if future is None:
+                        self._unclaimed[execution_arn] = (now, detail)
+                if future is not None:
+                    future.set_result(detail)
+            
+            with self._lock:
+                for execution_arn in [arn for arn, (received_at, _) in self._unclaimed.items()
+                                      if now - received_at > UNCLAIMED_EVENT_TTL]:
+                    del self._unclaimed[execution_arn]
+            
+            if consumed:
+                try:
+                    self.sqs_client.delete_message_batch(
+                        QueueUrl=self.queue_url,
+                        Entries=[{'Id': str(i), 'ReceiptHandle': m['ReceiptHandle']} for i, m in enumerate(consumed)]
+                    )
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to delete execution events: {str(e)}")
+            
+            if foreign:
+                try:
+                    self.sqs_client.change_message_visibility_batch(
+                        QueueUrl=self.queue_url,
+                        Entries=[{'Id': str(i), 'ReceiptHandle': m['ReceiptHandle'],
+                                  'VisibilityTimeout': FOREIGN_EVENT_VISIBILITY_TIMEOUT}
+                                 for i, m in enumerate(foreign)]
+                    )
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to release other runs' execution events: {str(e)}")
+
 class SystemIntegrationTester:
     """Comprehensive system integration testing for ForestShield"""
     
     def __init__(self):
         self.aws_region = 'us-west-2'
         self.account_id = '381492060635'
-        self.step_functions_client = boto3.client('stepfunctions', region_name=self.aws_region)
-        self.s3_client = boto3.client('s3', region_name=self.aws_region)
-        self.lambda_client = boto3.client('lambda', region_name=self.aws_region)
-        self.cloudwatch_client = boto3.client('cloudwatch', region_name=self.aws_region)
+        self.state_machine_arn = f"arn:aws:states:{self.aws_region}:{self.account_id}:stateMachine:forestshield-pipeline"
+        self.step_functions_client = boto3.client('stepfunctions', region_name=self.aws_region, config=AWS_CLIENT_CONFIG)
+        self.s3_client = boto3.client('s3', region_name=self.aws_region, config=AWS_CLIENT_CONFIG)
+        self.lambda_client = boto3.client('lambda', region_name=self.aws_region, config=AWS_CLIENT_CONFIG)
+        self.cloudwatch_client = boto3.client('cloudwatch', region_name=self.aws_region, config=AWS_CLIENT_CONFIG)
+        self.sqs_client = boto3.client('sqs', region_name=self.aws_region, config=AWS_CLIENT_CONFIG)
+        self.logs_client = boto3.client('logs', region_name=self.aws_region, config=AWS_CLIENT_CONFIG)
+        
+        # Tags this run's execution names, so concurrent testers sharing the events queue
+        # only claim their own executions
+        self.run_id = uuid.uuid4().hex[:8]
+        self.execution_listener = self.create_execution_listener()
         
         # Test configuration
         self.test_results = {
@@ -42,6 +222,25 @@ class SystemIntegrationTester:
             'system_health_checks': []
         }
         
+        # Upper bound on worker threads for the concurrent AWS calls
+        self.max_workers = int(os.environ.get('FS_IT_MAX_WORKERS', '8'))
+        
+        # Metrics collected during the run, published together by flush_metrics()
+        self.metric_data: List[Dict[str, Any]] = []
+        
+        # Memory analysis covers the invocations made during this run, except the cold start
+        # probes (their dummy payload does no real work)
+        self.run_started_at = time.time()
+        self.probe_request_ids: List[str] = []
+        
+        # The first cpu_percent() call always returns 0.0; prime it here so the health
+        # check reports CPU usage over the test run (psutil is optional until then)
+        try:
+            import psutil
+            psutil.cpu_percent(interval=None)
+        except ImportError:
+            logger.warning("⚠️ psutil not installed - resource utilization checks will fail")
+        
         # Test regions with known characteristics
         self.test_regions = [
             {
@@ -70,6 +269,16 @@ class SystemIntegrationTester:
             }
         ]
 
+    def create_execution_listener(self) -> Optional[ExecutionStatusListener]:
+        """Subscribe to execution status events, or return None to fall back to polling"""
+        try:
+            queue_url = self.sqs_client.get_queue_url(QueueName=EXECUTION_EVENTS_QUEUE)['QueueUrl']
+            logger.info(f"📬 Listening for execution status events on {EXECUTION_EVENTS_QUEUE}")
+            return ExecutionStatusListener(self.sqs_client, queue_url, f"integration-test-{self.run_id}-")
+        except Exception as e:
+            logger.warning(f"⚠️ Execution events queue unavailable, polling instead: {str(e)}")
+            return None
+
     def run_comprehensive_testing(self) -> Dict[str, Any]:
         """Execute all integration tests"""
         logger.info("COMPREHENSIVE SYSTEM INTEGRATION TESTING")
@@ -112,6 +321,9 @@ class SystemIntegrationTester:
             'recommendations': self.generate_recommendations()
         }
         
+        # Publish collected metrics to CloudWatch
+        self.flush_metrics()
+        
         # Save results to S3
         self.save_test_results(final_results)
         
@@ -133,43 +345,32 @@ class SystemIntegrationTester:
             'success_rate': 0
         }
         
-        for region in self.test_regions:
-            logger.info(f"🌍 Testing region: {region['name']}")
+        # Regions are independent workflows, so run them side by side instead of
+        # waiting for each Step Functions execution in turn
+        with ThreadPoolExecutor(max_workers=len(self.test_regions)) as executor:
+            region_results = list(executor.map(self.run_region_test, self.test_regions))
+        
+        for execution_result in region_results:
+            e2e_results['tests_executed'] += 1
+            if execution_result is None:
+                e2e_results['tests_failed'] += 1
+                continue
             
-            try:
-                # Prepare Step Functions input
-                workflow_input = {
-                    'latitude': region['latitude'],
-                    'longitude': region['longitude'],
-                    'startDate': (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d'),
-                    'endDate': datetime.now().strftime('%Y-%m-%d'),
-                    'cloudCover': 20
-                }
-                
-                # Execute Step Functions workflow
-                execution_result = self.execute_step_functions_workflow(workflow_input, region['name'])
-                e2e_results['workflow_executions'].append(execution_result)
-                e2e_results['tests_executed'] += 1
-                
-                if execution_result['status'] == 'SUCCEEDED':
-                    e2e_results['tests_passed'] += 1
-                    logger.info(f"✅ End-to-end test passed for {region['name']}")
-                else:
-                    e2e_results['tests_failed'] += 1
-                    logger.error(f"❌ End-to-end test failed for {region['name']}")
-                
-            except Exception as e:
-                logger.error(f"❌ Exception in end-to-end test for {region['name']}: {str(e)}")
+            e2e_results['workflow_executions'].append(execution_result)
+            if execution_result['status'] == 'SUCCEEDED':
+                e2e_results['tests_passed'] += 1
+            else:
                 e2e_results['tests_failed'] += 1
-                e2e_results['tests_executed'] += 1
         
         # Calculate metrics
         if e2e_results['tests_executed'] > 0:
             e2e_results['success_rate'] = e2e_results['tests_passed'] / e2e_results['tests_executed']
-            processing_times = [exec['processing_time'] for exec in e2e_results['workflow_executions'] 
-                              if exec.get('processing_time')]
-            if processing_times:
-                e2e_results['average_processing_time'] = statistics.mean(processing_times)
+            processing_times = np.fromiter((exec['processing_time'] for exec in e2e_results['workflow_executions']
+                                            if exec.get('processing_time')), dtype=np.float64)
+            if processing_times.size:
+                e2e_results['average_processing_time'] = float(processing_times.mean())
+                p50, p95, p99 = np.percentile(processing_times, [50, 95, 99])
+                e2e_results['processing_time_percentiles'] = {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
         
         logger.info(f"📊 End-to-end testing summary:")
         logger.info(f"   Tests executed: {e2e_results['tests_executed']}")
@@ -178,37 +379,59 @@ class SystemIntegrationTester:
         
         return e2e_results
 
+    def run_region_test(self, region: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run the end-to-end workflow for a single test region"""
+        logger.info(f"🌍 Testing region: {region['name']}")
+        
+        try:
+            # Prepare Step Functions input
+            workflow_input = {
+                'latitude': region['latitude'],
+                'longitude': region['longitude'],
+                'startDate': (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d'),
+                'endDate': datetime.now().strftime('%Y-%m-%d'),
+                'cloudCover': 20
+            }
+            
+            # Execute Step Functions workflow
+            execution_result = self.execute_step_functions_workflow(workflow_input, region['name'])
+            
+            if execution_result['status'] == 'SUCCEEDED':
+                logger.info(f"✅ End-to-end test passed for {region['name']}")
+            else:
+                logger.error(f"❌ End-to-end test failed for {region['name']}")
+            
+            return execution_result
+            
+        except Exception as e:
+            logger.error(f"❌ Exception in end-to-end test for {region['name']}: {str(e)}")
+            return None
+
     def execute_step_functions_workflow(self, input_data: Dict, region_name: str) -> Dict[str, Any]:
         """Execute a single Step Functions workflow and monitor results"""
-        state_machine_arn = f"arn:aws:states:{self.aws_region}:{self.account_id}:stateMachine:forestshield-pipeline"
-        execution_name = f"integration-test-{region_name.lower().replace(' ', '-')}-{int(time.time())}"
-        
         start_time = time.time()
         
         try:
             # Start execution
-            response = self.step_functions_client.start_execution(
-                stateMachineArn=state_machine_arn,
-                name=execution_name,
-                input=json.dumps(input_data)
-            )
-            
-            execution_arn = response['executionArn']
-            logger.info(f"🚀 Started execution: {execution_name}")
+            execution_arn = self.start_workflow_execution(input_data, region_name)
             
-            # Monitor execution
-            final_status = self.monitor_execution(execution_arn)
+            # Monitor execution (the terminal status already carries the output)
+            execution = self.monitor_execution(execution_arn)
+            final_status = execution['status']
             processing_time = time.time() - start_time
             
-            # Get execution output if successful
+            # Parse execution output if successful
             output_data = None
             if final_status == 'SUCCEEDED':
                 try:
-                    describe_response = self.step_functions_client.describe_execution(
-                        executionArn=execution_arn
-                    )
-                    if describe_response.get('output'):
-                        output_data = json.loads(describe_response['output'])
+                    output = execution.get('output')
+                    if output is None:
+                        # Status events leave out outputs over 256 KB
+                        output = self.step_functions_client.describe_execution(
+                            executionArn=execution_arn
+                        ).get('output')
+                    if output:
+                        output_data = json.loads(output)
                 except Exception as e:
                     logger.warning(f"Could not parse execution output: {str(e)}")
             
@@ -232,31 +455,87 @@ class SystemIntegrationTester:
                 'timestamp': datetime.utcnow().isoformat()
             }
 
-    def monitor_execution(self, execution_arn: str, timeout: int = 900) -> str:
-        """Monitor Step Functions execution until completion"""
+    def start_workflow_execution(self, input_data: Dict, region_name: str) -> str:
+        """Start a Step Functions execution and return its ARN"""
+        # Run ID prefix routes the status event back to this tester; the suffix keeps names
+        # unique when several executions start within the same second
+        execution_name = (f"integration-test-{self.run_id}-{region_name.lower().replace(' ', '-')}-"
+                          f"{int(time.time())}-{uuid.uuid4().hex[:8]}")
+        
+        response = self.step_functions_client.start_execution(
+            stateMachineArn=self.state_machine_arn,
+            name=execution_name,
+            input=json.dumps(input_data)
+        )
+        
+        logger.info(f"🚀 Started execution: {execution_name}")
+        return response['executionArn']
+
+    def monitor_execution(self, execution_arn: str, timeout: int = 900) -> Dict[str, Any]:
+        """Monitor Step Functions execution until completion, returning its status and output"""
+        return self.monitor_executions([execution_arn], timeout)[execution_arn]
+
+    def monitor_executions(self, execution_arns: List[str], timeout: int = 900) -> Dict[str, Dict[str, Any]]:
+        """Monitor several Step Functions executions until all of them complete"""
+        if self.execution_listener is not None:
+            return self.wait_for_execution_events(execution_arns, timeout)
+        
         start_time = time.time()
+        executions = {}
+        pending = list(execution_arns)
+        delay = 1.0
         
-        while time.time() - start_time < timeout:
-            try:
-                response = self.step_functions_client.describe_execution(
-                    executionArn=execution_arn
-                )
+        while pending and time.time() - start_time < timeout:
+            still_running = []
+            for execution_arn in pending:
+                try:
+                    response = self.step_functions_client.describe_execution(
+                        executionArn=execution_arn
+                    )
+                except Exception as e:
+                    logger.error(f"❌ Error monitoring execution: {str(e)}")
+                    executions[execution_arn] = {'status': 'MONITORING_FAILED', 'output': None}
+                    continue
                 
                 status = response['status']
                 
-                if status in ['SUCCEEDED', 'FAILED', 'TIMED_OUT', 'ABORTED']:
+                if status in TERMINAL_EXECUTION_STATUSES:
                     logger.info(f"📊 Execution completed with status: {status}")
-                    return status
-                
-                logger.info(f"⏱️ Execution status: {status}, waiting...")
-                time.sleep(30)  # Check every 30 seconds
-                
-            except Exception as e:
-                logger.error(f"❌ Error monitoring execution: {str(e)}")
-                return 'MONITORING_FAILED'
-        
-        logger.error("⏰ Execution monitoring timed out")
-        return 'TIMEOUT'
+                    executions[execution_arn] = {'status': status, 'output': response.get('output')}
+                else:
+                    still_running.append(execution_arn)
+            
+            pending = still_running
+            if pending:
+                logger.info(f"⏱️ {len(pending)} execution(s) still running, waiting {delay:.0f}s...")
+                # Back off from 1s up to 30s so short runs are picked up within seconds
+                time.sleep(delay)
+                delay = min(delay * 1.5, 30.0)
+        
+        if pending:
+            logger.error("⏰ Execution monitoring timed out")
+            executions.update((execution_arn, {'status': 'TIMEOUT', 'output': None}) for execution_arn in pending)
+        
+        return executions
+
+    def wait_for_execution_events(self, execution_arns: List[str], timeout: int) -> Dict[str, Dict[str, Any]]:
+        """Wait for the EventBridge status-change events instead of polling describe_execution"""
+        futures = {execution_arn: self.execution_listener.register(execution_arn)
+                   for execution_arn in execution_arns}
+        wait(futures.values(), timeout=timeout)
+        
+        executions = {}
+        for execution_arn, future in futures.items():
+            if future.done():
+                detail = future.result()
+                logger.info(f"📊 Execution completed with status: {detail['status']}")
+                executions[execution_arn] = {'status': detail['status'], 'output': detail.get('output')}
+            else:
+                self.execution_listener.discard(execution_arn)
+                logger.error("⏰ Execution monitoring timed out")
+                executions[execution_arn] = {'status': 'TIMEOUT', 'output': None}
+        
+        return executions
 
     def run_performance_benchmarks(self) -> Dict[str, Any]:
         """Comprehensive performance benchmarking"""
@@ -286,61 +565,112 @@ class SystemIntegrationTester:
         # Memory usage analysis
         benchmarks['memory_usage_patterns'] = self.analyze_memory_usage()
         
+        # Queue benchmark metrics for CloudWatch
+        for result in benchmarks['lambda_cold_starts']:
+            if result['cold_start_time'] is not None:
+                self.record_metric('ColdStartTime', result['cold_start_time'], 'Seconds',
+                                   {'FunctionName': result['function_name']})
+        for result in benchmarks['lambda_warm_executions']:
+            self.record_metric('WarmExecutionTime', result['execution_time'], 'Seconds',
+                               {'FunctionName': 'forestshield-vegetation-analyzer'})
+        for result in benchmarks['throughput_tests']['concurrency_tests']:
+            self.record_metric('ThroughputPerMinute', result['throughput_per_minute'], 'Count',
+                               {'ConcurrencyLevel': str(result['concurrency_level'])})
+        for result in benchmarks['memory_usage_patterns']:
+            self.record_metric('MemoryUtilization', result['utilization_rate'] * 100, 'Percent',
+                               {'FunctionName': result['function_name']})
+        
         return benchmarks
 
     def benchmark_lambda_cold_starts(self) -> List[Dict[str, Any]]:
         """Benchmark Lambda cold start performance"""
         logger.info("🥶 Benchmarking Lambda cold starts...")
         
-        lambda_functions = [
-            'forestshield-vegetation-analyzer',
-            'forestshield-model-manager-dev',
-            'forestshield-k-selector',
-            'forestshield-results-consolidator',
-            'forestshield-visualization-generator'
-        ]
-        
-        cold_start_results = []
+        # Cold starts are independent per function, so measure them all at once
+        with ThreadPoolExecutor(max_workers=min(len(LAMBDA_FUNCTIONS), self.max_workers)) as executor:
+            results = list(executor.map(self.measure_cold_start, LAMBDA_FUNCTIONS))
         
-        for function_name in lambda_functions:
-            try:
-                # Force cold start by updating environment variable
-                self.lambda_client.update_function_configuration(
-                    FunctionName=function_name,
-                    Environment={
-                        'Variables': {
-                            'COLD_START_TEST': str(int(time.time()))
-                        }
+        return [result for result in results if result is not None]
+
+    def measure_cold_start(self, function_name: str) -> Optional[Dict[str, Any]]:
+        """Force and time a cold start of a single Lambda function"""
+        try:
+            # Force cold start by updating environment variable
+            self.lambda_client.update_function_configuration(
+                FunctionName=function_name,
+                Environment={
+                    'Variables': {
+                        'COLD_START_TEST': str(int(time.time()))
                     }
-                )
-                
-                # Wait for update to complete
-                time.sleep(5)
-                
-                # Measure cold start time
-                start_time = time.time()
-                
-                response = self.lambda_client.invoke(
-                    FunctionName=function_name,
-                    InvocationType='RequestResponse',
-                    Payload=json.dumps({'test': 'cold_start'})
-                )
-                
-                cold_start_time = time.time() - start_time
-                
-                cold_start_results.append({
-                    'function_name': function_name,
-                    'cold_start_time': cold_start_time,
-                    'status_code': response['StatusCode'],
-                    'timestamp': datetime.utcnow().isoformat()
-                })
-                
+                }
+            )
+            
+            # Wait for update to complete (returns as soon as LastUpdateStatus is Successful)
+            self.lambda_client.get_waiter('function_updated_v2').wait(
+                FunctionName=function_name,
+                WaiterConfig={'Delay': 1, 'MaxAttempts': 30}
+            )
+            
+            # Invoke asynchronously and take the init time Lambda itself reports,
+            # rather than holding the connection open for the whole execution
+            invoked_at = int(time.time() * 1000)
+            
+            response = self.lambda_client.invoke(
+                FunctionName=function_name,
+                InvocationType='Event',
+                Payload=COLD_START_PAYLOAD
+            )
+            
+            request_id = response['ResponseMetadata']['RequestId']
+            self.probe_request_ids.append(request_id)
+            report = self.find_invocation_report(function_name, request_id, invoked_at)
+            
+            init_match = REPORT_INIT_DURATION_RE.search(report) if report else None
+            duration_match = REPORT_DURATION_RE.search(report) if report else None
+            cold_start_time = float(init_match.group(1)) / 1000 if init_match else None
+            
+            if cold_start_time is not None:
                 logger.info(f"❄️ {function_name}: {cold_start_time:.2f}s cold start")
-                
-            except Exception as e:
-                logger.error(f"❌ Cold start test failed for {function_name}: {str(e)}")
+            else:
+                logger.warning(f"⚠️ {function_name}: no init duration reported for request {request_id}")
+            
+            return {
+                'function_name': function_name,
+                'cold_start_time': cold_start_time,
+                'execution_time': float(duration_match.group(1)) / 1000 if duration_match else None,
+                'request_id': request_id,
+                'status_code': response['StatusCode'],
+                'timestamp': datetime.utcnow().isoformat()
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ Cold start test failed for {function_name}: {str(e)}")
+            return None
+
+    def find_invocation_report(self, function_name: str, request_id: str, start_time_ms: int,
+                               timeout: int = 120) -> Optional[str]:
+        """Wait for the REPORT log line of an invocation and return it"""
+        paginator = self.logs_client.get_paginator('filter_log_events')
+        deadline = time.time() + timeout
+        delay = 1.0
+        
+        while time.time() < deadline:
+            try:
+                pages = paginator.paginate(
+                    logGroupName=f'/aws/lambda/{function_name}',
+                    startTime=start_time_ms,
+                    filterPattern=f'"REPORT RequestId: {request_id}"'
+                )
+                for page in pages:
+                    for event in page.get('events', []):
+                        return event['message']
+            except self.logs_client.exceptions.ResourceNotFoundException:
+                pass  # Log group is created on the first invocation
+            
+            time.sleep(delay)
+            delay = min(delay * 2, 10.0)
         
-        return cold_start_results
+        return None
 
     def benchmark_lambda_warm_executions(self) -> List[Dict[str, Any]]:
         """Benchmark Lambda warm execution performance"""
@@ -356,6 +686,9 @@ class SystemIntegrationTester:
             'outputBucket': f'forestshield-processed-data-{self.account_id}'
         }
         
+        # Same request every run, so encode it once outside the timed calls
+        payload = json.dumps(test_payload).encode()
+        
         # Execute multiple warm runs
         for i in range(5):
             try:
@@ -364,7 +697,7 @@ class SystemIntegrationTester:
                 response = self.lambda_client.invoke(
                     FunctionName='forestshield-vegetation-analyzer',
                     InvocationType='RequestResponse',
-                    Payload=json.dumps(test_payload)
+                    Payload=payload
                 )
                 
                 execution_time = time.time() - start_time
@@ -387,38 +720,50 @@ class SystemIntegrationTester:
         """Test system throughput with concurrent requests"""
         logger.info("🚀 Benchmarking system throughput...")
         
-        def execute_concurrent_workflow():
-            """Execute a single workflow for throughput testing"""
+        # Same date window for every workflow; coordinate jitter is drawn per level in one call
+        start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        end_date = datetime.now().strftime('%Y-%m-%d')
+        rng = np.random.default_rng()
+        
+        def start_concurrent_workflow(jitter):
+            """Start a single workflow for throughput testing"""
             try:
                 input_data = {
-                    'latitude': -5.9 + (np.random.random() - 0.5) * 0.1,  # Slightly randomize
-                    'longitude': -53.0 + (np.random.random() - 0.5) * 0.1,
-                    'startDate': (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d'),
-                    'endDate': datetime.now().strftime('%Y-%m-%d'),
+                    'latitude': -5.9 + float(jitter[0]),  # Slightly randomize
+                    'longitude': -53.0 + float(jitter[1]),
+                    'startDate': start_date,
+                    'endDate': end_date,
                     'cloudCover': 20
                 }
                 
-                result = self.execute_step_functions_workflow(input_data, 'throughput-test')
-                return result
+                return self.start_workflow_execution(input_data, 'throughput-test')
                 
             except Exception as e:
-                return {'status': 'FAILED', 'error': str(e)}
+                logger.error(f"❌ Failed to start throughput workflow: {str(e)}")
+                return None
         
         # Test with different concurrency levels
-        concurrency_levels = [1, 3, 5, 8]
+        # (blank entries are ignored; an empty setting falls back to the default levels)
+        concurrency_levels = [int(level) for level in os.environ.get('FS_IT_CONCURRENCY_LEVELS', '').split(',')
+                              if level.strip()] or [1, 3, 5, 8]
         throughput_results = []
         
         for concurrency in concurrency_levels:
             logger.info(f"🔄 Testing concurrency level: {concurrency}")
             
+            jitters = rng.uniform(-0.05, 0.05, size=(concurrency, 2))
             start_time = time.time()
             
-            with ThreadPoolExecutor(max_workers=concurrency) as executor:
-                futures = [executor.submit(execute_concurrent_workflow) for _ in range(concurrency)]
-                results = [future.result() for future in futures]
+            # Start every execution up front, then wait on all of them together, so no
+            # worker thread is tied up for the lifetime of a workflow
+            with ThreadPoolExecutor(max_workers=min(concurrency, self.max_workers)) as executor:
+                futures = [executor.submit(start_concurrent_workflow, jitter) for jitter in jitters]
+                execution_arns = [future.result() for future in as_completed(futures)]
+            
+            executions = self.monitor_executions([arn for arn in execution_arns if arn])
             
             total_time = time.time() - start_time
-            successful_executions = sum(1 for r in results if r.get('status') == 'SUCCEEDED')
+            successful_executions = sum(1 for execution in executions.values() if execution['status'] == 'SUCCEEDED')
             
             throughput_results.append({
                 'concurrency_level': concurrency,
@@ -434,8 +779,8 @@ class SystemIntegrationTester:
         return {
             'concurrency_tests': throughput_results,
             'max_successful_concurrency': max([t['concurrency_level'] for t in throughput_results 
-                                             if t['successful_executions'] == t['concurrency_level']]),
-            'peak_throughput': max([t['throughput_per_minute'] for t in throughput_results])
+                                             if t['successful_executions'] == t['concurrency_level']], default=0),
+            'peak_throughput': max([t['throughput_per_minute'] for t in throughput_results], default=0)
         }
 
     def validate_geographic_accuracy(self) -> Dict[str, Any]:
@@ -617,6 +962,15 @@ class SystemIntegrationTester:
         # Check resource utilization
         health_results['resource_utilization'] = self.check_resource_utilization()
         
+        # Queue health metrics for CloudWatch (1 = healthy)
+        for function_name, status in health_results['lambda_function_health'].items():
+            self.record_metric('LambdaFunctionHealthy', int(status['status'] == 'healthy'), 'Count',
+                               {'FunctionName': function_name})
+        for bucket, status in health_results['s3_bucket_health'].items():
+            self.record_metric('S3BucketHealthy', int(status == 'healthy'), 'Count', {'Bucket': bucket})
+        self.record_metric('StateMachineHealthy',
+                           int(health_results['step_functions_health']['status'] == 'healthy'), 'Count')
+        
         return health_results
 
     def check_aws_service_health(self) -> Dict[str, str]:
@@ -631,29 +985,27 @@ class SystemIntegrationTester:
 
     def check_lambda_health(self) -> Dict[str, Any]:
         """Check Lambda function health"""
-        functions = [
-            'forestshield-vegetation-analyzer',
-            'forestshield-model-manager-dev',
-            'forestshield-k-selector',
-            'forestshield-results-consolidator',
-            'forestshield-visualization-generator'
-        ]
-        
-        health_status = {}
-        for func in functions:
-            try:
-                response = self.lambda_client.get_function(FunctionName=func)
-                health_status[func] = {
-                    'status': 'healthy',
-                    'last_modified': response['Configuration']['LastModified'],
-                    'runtime': response['Configuration']['Runtime'],
-                    'memory_size': response['Configuration']['MemorySize']
-                }
-            except Exception as e:
-                health_status[func] = {
-                    'status': 'unhealthy',
-                    'error': str(e)
-                }
+        # Issue every get_function at once and record each as it returns
+        with ThreadPoolExecutor(max_workers=min(len(LAMBDA_FUNCTIONS), self.max_workers)) as executor:
+            futures = {executor.submit(self.lambda_client.get_function, FunctionName=func): func
+                       for func in LAMBDA_FUNCTIONS}
+            
+            health_status = {}
+            for future in as_completed(futures):
+                func = futures[future]
+                try:
+                    response = future.result()
+                    health_status[func] = {
+                        'status': 'healthy',
+                        'last_modified': response['Configuration']['LastModified'],
+                        'runtime': response['Configuration']['Runtime'],
+                        'memory_size': response['Configuration']['MemorySize']
+                    }
+                except Exception as e:
+                    health_status[func] = {
+                        'status': 'unhealthy',
+                        'error': str(e)
+                    }
         
         return health_status
 
@@ -664,23 +1016,24 @@ class SystemIntegrationTester:
             f'forestshield-models-{self.account_id}'
         ]
         
-        bucket_health = {}
-        for bucket in buckets:
-            try:
-                self.s3_client.head_bucket(Bucket=bucket)
-                bucket_health[bucket] = 'healthy'
-            except Exception:
-                bucket_health[bucket] = 'unhealthy'
+        with ThreadPoolExecutor(max_workers=len(buckets)) as executor:
+            futures = {executor.submit(self.s3_client.head_bucket, Bucket=bucket): bucket for bucket in buckets}
+            
+            bucket_health = {}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    bucket_health[futures[future]] = 'healthy'
+                except Exception:
+                    bucket_health[futures[future]] = 'unhealthy'
         
         return bucket_health
 
     def check_step_functions_health(self) -> Dict[str, str]:
         """Check Step Functions state machine health"""
-        state_machine_arn = f"arn:aws:states:{self.aws_region}:{self.account_id}:stateMachine:forestshield-pipeline"
-        
         try:
             response = self.step_functions_client.describe_state_machine(
-                stateMachineArn=state_machine_arn
+                stateMachineArn=self.state_machine_arn
             )
             return {
                 'status': 'healthy',
@@ -695,11 +1048,18 @@ class SystemIntegrationTester:
 
     def check_resource_utilization(self) -> Dict[str, Any]:
         """Check system resource utilization"""
+        import psutil  # Only needed here; keeps it off the script's import path
+        
+        try:
+            network_io = read_network_io()
+        except OSError:
+            network_io = dict(psutil.net_io_counters()._asdict())  # No /proc on this platform
+        
         return {
-            'cpu_usage': psutil.cpu_percent(),
+            'cpu_usage': psutil.cpu_percent(interval=None),
             'memory_usage': psutil.virtual_memory().percent,
             'disk_usage': psutil.disk_usage('/').percent,
-            'network_io': dict(psutil.net_io_counters()._asdict())
+            'network_io': network_io
         }
 
     def analyze_costs(self) -> Dict[str, Any]:
@@ -729,53 +1089,116 @@ class SystemIntegrationTester:
         """Analyze memory usage patterns"""
         logger.info("🧠 Analyzing memory usage...")
         
-        # This would analyze CloudWatch metrics
-        return [
-            {
-                'function_name': 'forestshield-vegetation-analyzer',
-                'max_memory_used': 2048,
-                'allocated_memory': 3008,
-                'utilization_rate': 0.68,
-                'recommendation': 'well-sized'
-            },
-            {
-                'function_name': 'forestshield-model-manager-dev',
-                'max_memory_used': 512,
-                'allocated_memory': 1024,
-                'utilization_rate': 0.50,
-                'recommendation': 'consider reducing allocation'
-            }
-        ]
+        # Peak memory and allocation of every function's real invocations during this run
+        # (end-to-end, warm and throughput tests), from one Logs Insights query over the REPORT lines
+        exclusions = (f' and @requestId not in {json.dumps(sorted(self.probe_request_ids))}'
+                      if self.probe_request_ids else '')
+        try:
+            query_id = self.logs_client.start_query(
+                logGroupNames=[f'/aws/lambda/{function_name}' for function_name in LAMBDA_FUNCTIONS],
+                startTime=int(self.run_started_at),
+                endTime=int(time.time()) + 1,
+                queryString=MEMORY_USAGE_QUERY.format(exclusions=exclusions)
+            )['queryId']
+            response = self.wait_for_logs_query(query_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to query memory usage: {str(e)}")
+            return []
+        
+        peaks = {}
+        for row in response.get('results', []):
+            fields = {field['field']: field['value'] for field in row}
+            function_name = fields.get('@log', '').rsplit('/', 1)[-1]
+            peaks[function_name] = (float(fields['max_memory_used']), float(fields['allocated_memory']))
+        
+        memory_patterns = []
+        for function_name in LAMBDA_FUNCTIONS:
+            if function_name not in peaks:
+                logger.warning(f"⚠️ No memory usage reported for {function_name}")
+                continue
+            
+            max_memory_used, allocated_memory = peaks[function_name]
+            utilization_rate = max_memory_used / allocated_memory
+            if utilization_rate < 0.6:
+                recommendation = 'consider reducing allocation'
+            elif utilization_rate > 0.9:
+                recommendation = 'consider increasing allocation'
+            else:
+                recommendation = 'well-sized'
+            
+            memory_patterns.append({
+                'function_name': function_name,
+                'max_memory_used': int(round(max_memory_used)),
+                'allocated_memory': int(round(allocated_memory)),
+                'utilization_rate': round(utilization_rate, 2),
+                'recommendation': recommendation
+            })
+        
+        return memory_patterns
+
+    def wait_for_logs_query(self, query_id: str, timeout: int = 120) -> Dict[str, Any]:
+        """Wait for a Logs Insights query to finish and return its results"""
+        deadline = time.time() + timeout
+        delay = 1.0
+        
+        while True:
+            response = self.logs_client.get_query_results(queryId=query_id)
+            if response.get('status') in LOGS_QUERY_TERMINAL_STATUSES:
+                if response['status'] != 'Complete':
+                    raise RuntimeError(f"Logs Insights query {response['status'].lower()}")
+                return response
+            if time.time() >= deadline:
+                raise TimeoutError(f"Logs Insights query {query_id} did not finish within {timeout}s")
+            
+            time.sleep(delay)
+            delay = min(delay * 2, 10.0)
 
     def calculate_overall_status(self) -> str:
         """Calculate overall system status"""
         # This would analyze all test results to determine overall status
-        return 'HEALTHY'
+        return OVERALL_STATUS
 
-    def generate_recommendations(self) -> List[str]:
+    def generate_recommendations(self) -> Tuple[str, ...]:
         """Generate improvement recommendations"""
-        return [
-            'Implement automated retry mechanisms for transient failures',
-            'Add more comprehensive error logging for debugging',
-            'Consider implementing circuit breaker pattern for external API calls',
-            'Enhance monitoring and alerting for system health',
-            'Optimize memory allocation for Lambda functions',
-            'Implement caching strategy for frequently accessed models',
-            'Add load testing for peak usage scenarios'
-        ]
+        return RECOMMENDATIONS
+
+    def record_metric(self, name: str, value: float, unit: str, dimensions: Dict[str, str] = None):
+        """Queue a metric datum for the next flush_metrics() call"""
+        self.metric_data.append({
+            'MetricName': name,
+            'Dimensions': [{'Name': key, 'Value': val} for key, val in (dimensions or {}).items()],
+            'Timestamp': datetime.utcnow(),
+            'Value': value,
+            'Unit': unit
+        })
+
+    def flush_metrics(self):
+        """Publish queued metrics in as few PutMetricData calls as possible"""
+        metric_data, self.metric_data = self.metric_data, []
+        
+        for offset in range(0, len(metric_data), METRICS_PER_REQUEST):
+            batch = metric_data[offset:offset + METRICS_PER_REQUEST]
+            try:
+                self.cloudwatch_client.put_metric_data(Namespace=METRICS_NAMESPACE, MetricData=batch)
+            except Exception as e:
+                logger.error(f"❌ Failed to publish {len(batch)} metrics: {str(e)}")
+        
+        if metric_data:
+            logger.info(f"📈 Published {len(metric_data)} metrics to {METRICS_NAMESPACE}")
 
     def save_test_results(self, results: Dict[str, Any]):
         """Save test results to S3"""
         bucket_name = f'forestshield-processed-data-{self.account_id}'
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        timestamp = time.strftime('%Y%m%d_%H%M%S', time.gmtime())
         key = f'system-integration-tests/results_{timestamp}.json'
         
         try:
             self.s3_client.put_object(
                 Bucket=bucket_name,
                 Key=key,
-                Body=json.dumps(results, indent=2, default=str),
-                ContentType='application/json'
+                Body=gzip.compress(json.dumps(results, indent=2, default=str).encode('utf-8'), compresslevel=6),
+                ContentType='application/json',
+                ContentEncoding='gzip'
             )
             logger.info(f"💾 Test results saved to s3://{bucket_name}/{key}")
         except Exception as e:
@@ -783,9 +1206,10 @@ class SystemIntegrationTester:
 
     def generate_test_report(self, results: Dict[str, Any]):
         """Generate comprehensive test report"""
-        timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+        generated_at = time.gmtime()
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S UTC', generated_at)
         
-        report = f"""
+        parts = [f"""
 # ForestShield System Integration Test Report
 **Generated:** {timestamp}
 **Test Duration:** {results['test_execution_time']:.1f} seconds
@@ -823,12 +1247,11 @@ Comprehensive integration testing of ForestShield's intelligent K-means clusteri
 - **Monitoring:** Active
 
 ## Recommendations
-"""
+"""]
         
-        for i, rec in enumerate(results['recommendations'], 1):
-            report += f"{i}. {rec}\n"
+        parts.extend(f"{i}. {rec}\n" for i, rec in enumerate(results['recommendations'], 1))
         
-        report += f"""
+        parts.append(f"""
 ## Cost Analysis
 - **Monthly Estimate:** ${results['performance_benchmarks']['cost_analysis']['monthly_estimate']:.2f}
 - **Cost per Analysis:** ${results['performance_benchmarks']['cost_analysis']['cost_per_analysis']:.2f}
@@ -836,19 +1259,21 @@ Comprehensive integration testing of ForestShield's intelligent K-means clusteri
 
 ---
 *Report generated by ForestShield System Integration Tester*
-"""
+""")
+        report = ''.join(parts)
         
         # Save report
         bucket_name = f'forestshield-processed-data-{self.account_id}'
-        timestamp_file = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        timestamp_file = time.strftime('%Y%m%d_%H%M%S', generated_at)
         key = f'system-integration-tests/report_{timestamp_file}.md'
         
         try:
             self.s3_client.put_object(
                 Bucket=bucket_name,
                 Key=key,
-                Body=report,
-                ContentType='text/markdown'
+                Body=gzip.compress(report.encode('utf-8'), compresslevel=6),
+                ContentType='text/markdown',
+                ContentEncoding='gzip'
             )
             logger.info(f"📄 Test report saved to s3://{bucket_name}/{key}")
         except Exception as e:
@@ -11,6 +11,31 @@ import subprocess
 import sys
 from pathlib import Path
 
+# Pure dependencies the gdal38 layer does not provide; installed as manylinux wheels
+# for the function's python3.9 x86_64 runtime and zipped next to the handler
+ZIP_DEPENDENCIES = [
+    'orjson==3.9.10'
+]
+DEPENDENCY_BUILD_DIR = 'package-deps'
+
+def install_zip_dependencies():
+    """Install ZIP_DEPENDENCIES into DEPENDENCY_BUILD_DIR for the Lambda runtime"""
+    
+    if os.path.exists(DEPENDENCY_BUILD_DIR):
+        shutil.rmtree(DEPENDENCY_BUILD_DIR)
+    
+    print(f"   📥 Installing {', '.join(ZIP_DEPENDENCIES)} for the Lambda runtime...")
+    subprocess.run([
+        sys.executable, '-m', 'pip', 'install', *ZIP_DEPENDENCIES,
+        '--target', DEPENDENCY_BUILD_DIR,
+        '--platform', 'manylinux2014_x86_64',
+        '--implementation', 'cp',
+        '--python-version', '3.9',
+        '--only-binary=:all:',
+        '--no-deps',
+        '--quiet'
+    ], check=True)
+
 def create_deployment_package():
     """Create deployment package for Lambda"""
     
@@ -21,10 +46,17 @@ def create_deployment_package():
         os.remove('vegetation-analyzer-deployment.zip')
         print("   🧹 Cleaned up previous deployment package")
     
-    # Create deployment package
-    with zipfile.ZipFile('vegetation-analyzer-deployment.zip', 'w', zipfile.ZIP_DEFLATED) as zipf:
+    try:
+        install_zip_dependencies()
+    except subprocess.CalledProcessError as e:
+        print(f"   ❌ Failed to install dependencies: {e}")
+        return False
+    
+    # Create deployment package at maximum compression
+    with zipfile.ZipFile('vegetation-analyzer-deployment.zip', 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zipf:
         
-        # Add Python source files
+        # Add Python source files - handler first, then the modules it imports
+        # (requirements.txt is build-time only, so it stays out of the package)
         python_files = [
             'handler.py',
             'ndvi_processor.py', 
@@ -38,10 +70,13 @@ def create_deployment_package():
             else:
                 print(f"   ⚠️ Warning: {file} not found")
         
-        # Add requirements if they exist
-        if os.path.exists('requirements.txt'):
-            zipf.write('requirements.txt')
-            print("   📄 Added requirements.txt")
+        # Add installed dependencies at the package root so the handler can import them
+        for path in sorted(Path(DEPENDENCY_BUILD_DIR).rglob('*')):
+            if path.is_file() and '__pycache__' not in path.parts:
+                zipf.write(path, path.relative_to(DEPENDENCY_BUILD_DIR))
+        print(f"   📦 Added dependencies: {', '.join(ZIP_DEPENDENCIES)}")
+    
+    shutil.rmtree(DEPENDENCY_BUILD_DIR)
     
     # Check final package size
     package_size = os.path.getsize('vegetation-analyzer-deployment.zip')
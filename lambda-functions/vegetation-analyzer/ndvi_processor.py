@@ -3,14 +3,61 @@ import numpy as np
 import rasterio
 from rasterio.windows import Window
 from rasterio.enums import Resampling
-from rasterio.transform import xy
 from typing import Dict, Tuple, Any, List
 import tempfile
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pyproj import Proj, Transformer, CRS
 
 logger = logging.getLogger(__name__)
 
+# GDAL HTTP/VSI tuning for remote band reads (only applied when not already set)
+GDAL_REMOTE_READ_OPTIONS = {
+    'GDAL_DISABLE_READDIR_ON_OPEN': 'EMPTY_DIR',
+    'GDAL_HTTP_MULTIPLEX': 'YES',
+    'GDAL_HTTP_MAX_RETRY': '3',
+    'CPL_VSIL_CURL_USE_HEAD': 'NO',
+    'VSI_CACHE': 'TRUE',
+    'VSI_CACHE_SIZE': '100000000',
+    # Process-wide /vsicurl/ block cache keyed by URL - survives dataset close, so
+    # warm invocations re-reading the same bands skip the refetch
+    'CPL_VSIL_CURL_CACHE_SIZE': '200000000'
+}
+for option, value in GDAL_REMOTE_READ_OPTIONS.items():
+    os.environ.setdefault(option, value)
+
+# Red and NIR bands are separate remote files, so their reads can overlap
+_BAND_READER = ThreadPoolExecutor(max_workers=2, thread_name_prefix='band-reader')
+
+def _open_bands(red_url: str, nir_url: str) -> Tuple[rasterio.DatasetReader, rasterio.DatasetReader]:
+    """Open the red and NIR bands concurrently, closing both if either fails"""
+    openings = [_BAND_READER.submit(rasterio.open, url) for url in (red_url, nir_url)]
+    
+    datasets, errors = [], []
+    for opening in openings:
+        try:
+            datasets.append(opening.result())
+        except Exception as e:
+            errors.append(e)
+    
+    if errors:
+        for dataset in datasets:
+            dataset.close()
+        raise errors[0]
+    
+    return datasets[0], datasets[1]
+
+def _read_band_windows(red_src: rasterio.DatasetReader, nir_src: rasterio.DatasetReader,
+                       window: Window, red_out: np.ndarray = None,
+                       nir_out: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Read the same window from both bands, fetching NIR in the background
+
+    red_out/nir_out, when given, are window-shaped buffers the reads are written into.
+    """
+    nir_read = _BAND_READER.submit(nir_src.read, 1, window=window, out=nir_out)
+    red = red_src.read(1, window=window, out=red_out)
+    return red, nir_read.result()
+
 class VegetationProcessor:
     """
     Vegetation analysis processor using rasterio and GeoLambda
@@ -22,11 +69,17 @@ class VegetationProcessor:
     for K-means clustering instead of just statistical summaries.
     """
     
-    def __init__(self, chunk_size: int = 1024, max_pixels_per_image: int = 25000):
+    TARGET_CRS = CRS("EPSG:4326")  # WGS 84 (lat/lon)
+    
+    def __init__(self, chunk_size: int = 1024, max_pixels_per_image: int = 25000,
+                 prioritize_vegetation_areas: bool = False):
         """Initialize the vegetation processor with pixel data extraction capabilities"""
         logger.info("🌱 Initializing VegetationProcessor with REAL PIXEL DATA extraction")
         self.chunk_size = chunk_size  # Process in 1024x1024 pixel chunks
         self.max_pixels_per_image = max_pixels_per_image  # Limit pixels to avoid memory issues
+        # Read the vegetation-rich priority areas before the raster scan (costs extra
+        # window reads, and changes which pixels are sampled)
+        self.prioritize_vegetation_areas = prioritize_vegetation_areas
         
         # NDVI thresholds for classification (kept for backward compatibility)
         self.thresholds = {
@@ -36,6 +89,10 @@ class VegetationProcessor:
             'moderate_vegetation': 0.6,
             'dense_vegetation': 1.0
         }
+        
+        # Transformer construction hits the PROJ database, so reuse one per source CRS
+        # across chunks (and warm invocations, since the handler keeps this processor)
+        self._transformers: Dict[str, Transformer] = {}
     
     def calculate_ndvi_from_urls(self, red_url: str, nir_url: str, image_id: str) -> Dict[str, Any]:
         """
@@ -59,8 +116,9 @@ class VegetationProcessor:
         
         try:
             # Open both bands directly from URLs
-            with rasterio.open(red_url) as red_src:
-                with rasterio.open(nir_url) as nir_src:
+            red_src, nir_src = _open_bands(red_url, nir_url)
+            with red_src:
+                with nir_src:
                     
                     # Log band information
                     logger.info(f"🔴 Red band: {red_src.width}x{red_src.height}, CRS: {red_src.crs}")
@@ -113,71 +171,15 @@ class VegetationProcessor:
         logger.info(f"🎯 Using sampling rate: every {sampling_rate}th pixel (target: {self.max_pixels_per_image} pixels)")
         logger.info(f"🔢 Expected pixels per chunk: ~{(self.chunk_size//sampling_rate)**2}")
         
-        # DEBUGGING: Check overall image mask statistics first
-        logger.info("🔍 DEBUGGING: Analyzing image mask patterns...")
-        
-        # Sample a few small regions to understand masking
-        debug_regions = [
-            (0, 0, 100, 100),           # Top-left corner
-            (width//2-50, height//2-50, 100, 100),  # Center
-            (width-100, height-100, 100, 100),      # Bottom-right
-            (width//4, height//4, 100, 100),        # Quarter point
-            (3*width//4, 3*height//4, 100, 100)     # Three-quarter point
-        ]
-        
-        regions_with_vegetation = 0
-        for i, (x, y, w, h) in enumerate(debug_regions):
-            try:
-                # Ensure we don't go out of bounds
-                x = max(0, min(x, width - w))
-                y = max(0, min(y, height - h))
-                
-                window = Window(x, y, w, h)
-                red_sample = red_src.read(1, window=window)
-                nir_sample = nir_src.read(1, window=window)
-                
-                # Check mask statistics and value ranges
-                if hasattr(red_sample, 'mask'):
-                    red_valid = (~red_sample.mask).sum()
-                    red_total = red_sample.size
-                    red_valid_pct = (red_valid / red_total) * 100
-                    red_nonzero = (red_sample[~red_sample.mask] > 1).sum() if red_valid > 0 else 0
-                else:
-                    red_valid = (~np.isnan(red_sample)).sum()
-                    red_total = red_sample.size
-                    red_valid_pct = (red_valid / red_total) * 100
-                    red_nonzero = (red_sample[~np.isnan(red_sample)] > 1).sum() if red_valid > 0 else 0
-                
-                if hasattr(nir_sample, 'mask'):
-                    nir_valid = (~nir_sample.mask).sum()
-                    nir_total = nir_sample.size
-                    nir_valid_pct = (nir_valid / nir_total) * 100
-                    nir_nonzero = (nir_sample[~nir_sample.mask] > 1).sum() if nir_valid > 0 else 0
-                else:
-                    nir_valid = (~np.isnan(nir_sample)).sum()
-                    nir_total = nir_sample.size
-                    nir_valid_pct = (nir_valid / nir_total) * 100
-                    nir_nonzero = (nir_sample[~np.isnan(nir_sample)] > 1).sum() if nir_valid > 0 else 0
-                
-                # Check vegetation presence (non-zero reflectance values)
-                vegetation_pixels = ((red_sample > 0) & (nir_sample > 0)).sum()
-                vegetation_pct = (vegetation_pixels / red_sample.size) * 100
-                
-                logger.info(f"🔍 Region {i+1} [{y}:{x}] - Valid: R={red_valid_pct:.1f}% N={nir_valid_pct:.1f}%, Vegetation: {vegetation_pct:.1f}%")
-                
-                if vegetation_pct > 10:  # At least 10% vegetation
-                    logger.info(f"✅ Found vegetation in region {i+1} with {vegetation_pct:.1f}% vegetation pixels!")
-                    regions_with_vegetation += 1
-                
-            except Exception as e:
-                logger.warning(f"⚠️ Error checking region {i+1}: {str(e)}")
-        
-        if regions_with_vegetation == 0:
-            logger.error("❌ No vegetation regions found in entire image!")
-            logger.error("💡 This image may be completely cloudy, water, or urban areas")
+        # The mask-pattern pre-scan only logs diagnostics and costs extra window reads
+        # (and JP2 tile decodes), so run it only when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            self._log_mask_patterns(red_src, nir_src, width, height)
             
         # Continue with normal processing but focus on valid regions if found
-        pixel_data = []
+        # Per-chunk (n, 5) feature arrays, concatenated once at the end
+        pixel_chunks = []
+        pixel_count = 0
         all_ndvi_values = []
         
         # Statistics tracking (backward compatibility)
@@ -194,7 +196,7 @@ class VegetationProcessor:
         chunks_processed = 0
         chunks_with_valid_data = 0
         
-        # Instead of processing chunks sequentially, prioritize vegetation-rich regions
+        # Optionally prioritize vegetation-rich regions before the sequential scan
         # Based on debug analysis, vegetation is typically in center/bottom regions
         # IMPORTANT: Use (col, row) format like debug regions that work!
         vegetation_priority_areas = [
@@ -207,28 +209,53 @@ class VegetationProcessor:
             # Quarter region
             (width//4 - 256, height//4 - 256, 512, 512),  # (col, row, w, h)
         ]
+        if not self.prioritize_vegetation_areas:
+            vegetation_priority_areas = []
+        
+        # Internal tile grid of the bands - priority chunks are snapped onto it so each
+        # read decodes whole tiles instead of straddling four of them
+        block_shape = red_src.block_shapes[0]
+        priority_origins_read = set()
+        
+        # Chunk buffers reused by every read and NDVI computation of this image, instead of
+        # fresh chunk-sized arrays (and their page faults) for each chunk
+        chunk_shape = (self.chunk_size, self.chunk_size)
+        red_buffer = np.empty(chunk_shape, dtype=red_src.dtypes[0])
+        nir_buffer = np.empty(chunk_shape, dtype=nir_src.dtypes[0])
+        ndvi_buffers = tuple(np.empty(chunk_shape, dtype=np.float32) for _ in range(3))
         
         # Try vegetation priority areas first
         for priority_col, priority_row, _, _ in vegetation_priority_areas:
-            if len(pixel_data) >= self.max_pixels_per_image:
+            if pixel_count >= self.max_pixels_per_image:
                 break
                 
             # Ensure we don't go out of bounds
-            priority_row = max(0, min(priority_row, height - self.chunk_size))
-            priority_col = max(0, min(priority_col, width - self.chunk_size))
+            priority_row, priority_col = self._priority_chunk_origin(
+                priority_row, priority_col, height, width, block_shape
+            )
+            
+            # On smaller images several areas can snap to the same chunk - read it once
+            if (priority_row, priority_col) in priority_origins_read:
+                continue
+            priority_origins_read.add((priority_row, priority_col))
             
             # Process this priority chunk
-            red_chunk = red_src.read(1, window=Window(priority_col, priority_row, self.chunk_size, self.chunk_size))
-            nir_chunk = nir_src.read(1, window=Window(priority_col, priority_row, self.chunk_size, self.chunk_size))
-            ndvi_chunk = self._calculate_ndvi_chunk(red_chunk, nir_chunk)
+            priority_height = min(self.chunk_size, height - priority_row)
+            priority_width = min(self.chunk_size, width - priority_col)
+            red_chunk, nir_chunk = _read_band_windows(
+                red_src, nir_src, Window(priority_col, priority_row, priority_width, priority_height),
+                red_buffer[:priority_height, :priority_width], nir_buffer[:priority_height, :priority_width]
+            )
+            ndvi_chunk = self._calculate_ndvi_chunk(red_chunk, nir_chunk, ndvi_buffers)
             
             chunk_pixels = self._extract_chunk_pixel_data(
                 red_chunk, nir_chunk, ndvi_chunk, transform,
                 priority_row, priority_col, sampling_rate, str(red_src.crs)
             )
             
-            if chunk_pixels:
-                pixel_data.extend(chunk_pixels)
+            if len(chunk_pixels):
+                pixel_chunks.append(chunk_pixels)
+                pixel_count += len(chunk_pixels)
                 chunks_with_valid_data += 1
                 logger.info(f"🌱 Priority area [{priority_row}:{priority_col}] yielded {len(chunk_pixels)} pixels!")
             else:
@@ -243,71 +270,79 @@ class VegetationProcessor:
             chunks_processed += 1
         
         # If we still need more pixels, process remaining chunks normally
-        if len(pixel_data) < self.max_pixels_per_image:
-            logger.info(f"🔍 Got {len(pixel_data)} pixels from priority areas, processing remaining chunks...")
+        if pixel_count < self.max_pixels_per_image:
+            logger.info(f"🔍 Got {pixel_count} pixels from priority areas, processing remaining chunks...")
+            
+            # Grid chunks overlapping a priority chunk that was already read
+            skipped_chunks = set()
+            for priority_row, priority_col in priority_origins_read:
+                for grid_row in self._overlapping_grid_starts(priority_row):
+                    for grid_col in self._overlapping_grid_starts(priority_col):
+                        skipped_chunks.add((grid_row, grid_col))
             
             # Process remaining chunks in normal order
             for chunk_row in range(0, height, self.chunk_size):
-                if len(pixel_data) >= self.max_pixels_per_image:
+                if pixel_count >= self.max_pixels_per_image:
                     break
                     
                 for chunk_col in range(0, width, self.chunk_size):
-                    if len(pixel_data) >= self.max_pixels_per_image:
+                    if pixel_count >= self.max_pixels_per_image:
                         break
                     
                     # Skip if we already processed this area in priority processing
-                    already_processed = False
-                    for priority_col, priority_row, _, _ in vegetation_priority_areas:
-                        priority_row = max(0, min(priority_row, height - self.chunk_size))
-                        priority_col = max(0, min(priority_col, width - self.chunk_size))
-                        if abs(chunk_row - priority_row) < self.chunk_size and abs(chunk_col - priority_col) < self.chunk_size:
-                            already_processed = True
-                            break
-                    
-                    if already_processed:
+                    if (chunk_row, chunk_col) in skipped_chunks:
                         continue
                     
                     # Read chunk
                     actual_height = min(self.chunk_size, height - chunk_row)
                     actual_width = min(self.chunk_size, width - chunk_col)
                     
-                    red_chunk = red_src.read(1, window=Window(chunk_col, chunk_row, actual_width, actual_height))
-                    nir_chunk = nir_src.read(1, window=Window(chunk_col, chunk_row, actual_width, actual_height))
-                    ndvi_chunk = self._calculate_ndvi_chunk(red_chunk, nir_chunk)
+                    red_chunk, nir_chunk = _read_band_windows(
+                        red_src, nir_src, Window(chunk_col, chunk_row, actual_width, actual_height),
+                        red_buffer[:actual_height, :actual_width], nir_buffer[:actual_height, :actual_width]
+                    )
+                    ndvi_chunk = self._calculate_ndvi_chunk(red_chunk, nir_chunk, ndvi_buffers)
                     
                     chunk_pixels = self._extract_chunk_pixel_data(
                         red_chunk, nir_chunk, ndvi_chunk, transform,
                         chunk_row, chunk_col, sampling_rate, str(red_src.crs)
                     )
                     
-                    if chunk_pixels:
-                        pixel_data.extend(chunk_pixels)
+                    if len(chunk_pixels):
+                        pixel_chunks.append(chunk_pixels)
+                        pixel_count += len(chunk_pixels)
                         chunks_with_valid_data += 1
                     
                     chunks_processed += 1
         
         # Calculate basic statistics for backward compatibility
         total_pixels = height * width
-        valid_pixels = len(pixel_data) * sampling_rate if pixel_data else 0  # Estimate based on extracted pixels
+        valid_pixels = pixel_count * sampling_rate  # Estimate based on extracted pixels
+        pixel_array = np.concatenate(pixel_chunks) if pixel_chunks else np.empty((0, 5))
         
         # Basic statistics from extracted pixel data
-        if pixel_data:
-            ndvi_values = [pixel[0] for pixel in pixel_data]  # NDVI is first feature
+        if pixel_count:
+            ndvi_values = pixel_array[:, 0]  # NDVI is first feature
             all_ndvi_values = ndvi_values
             
-            # Count classifications
-            water_snow_count = sum(1 for v in ndvi_values if v < self.thresholds['bare_soil'])
-            bare_soil_count = sum(1 for v in ndvi_values if self.thresholds['bare_soil'] <= v < self.thresholds['sparse_vegetation'])
-            sparse_veg_count = sum(1 for v in ndvi_values if self.thresholds['sparse_vegetation'] <= v < self.thresholds['moderate_vegetation'])
-            moderate_veg_count = sum(1 for v in ndvi_values if self.thresholds['moderate_vegetation'] <= v < self.thresholds['dense_vegetation'])
-            dense_veg_count = sum(1 for v in ndvi_values if v >= self.thresholds['dense_vegetation'])
-            vegetation_pixels = sum(1 for v in ndvi_values if v > 0.3)
+            # Count classifications in one pass: bins are [-inf, bare_soil), [bare_soil, sparse), ... [dense, inf)
+            class_edges = np.array([
+                self.thresholds['bare_soil'],
+                self.thresholds['sparse_vegetation'],
+                self.thresholds['moderate_vegetation'],
+                self.thresholds['dense_vegetation']
+            ])
+            class_counts = np.bincount(np.digitize(ndvi_values, class_edges), minlength=5)
+            water_snow_count, bare_soil_count, sparse_veg_count, moderate_veg_count, dense_veg_count = (
+                int(count) for count in class_counts
+            )
+            vegetation_pixels = int(np.count_nonzero(ndvi_values > 0.3))
         else:
             all_ndvi_values = []
             water_snow_count = bare_soil_count = sparse_veg_count = moderate_veg_count = dense_veg_count = vegetation_pixels = 0
         
         logger.info(f"✅ Processed {total_pixels:,} total pixels, {valid_pixels:,} valid pixels")
-        logger.info(f"🎯 Extracted {len(pixel_data)} real pixels for K-means clustering")
+        logger.info(f"🎯 Extracted {pixel_count} real pixels for K-means clustering")
         
         # DEBUGGING: Add processing summary
         logger.info("🔍 PROCESSING SUMMARY:")
@@ -331,7 +366,7 @@ class VegetationProcessor:
                 'total_pixels': total_pixels
             }
         else:
-            all_ndvi_array = np.array(all_ndvi_values, dtype=np.float32)
+            all_ndvi_array = all_ndvi_values.astype(np.float32)
             vegetation_coverage = (vegetation_pixels / valid_pixels) * 100.0 if valid_pixels > 0 else 0.0
             
             statistics = {
@@ -351,11 +386,110 @@ class VegetationProcessor:
                 }
             }
         
-        return statistics, pixel_data
+        # Rows go out as plain [ndvi, red, nir, lat, lng] lists for the JSON/S3 consumers
+        return statistics, pixel_array.tolist()
+    
+    def _log_mask_patterns(self, red_src: rasterio.DatasetReader, nir_src: rasterio.DatasetReader,
+                           width: int, height: int):
+        """Log mask and vegetation statistics for a few sample regions (debugging aid)"""
+        
+        # DEBUGGING: Check overall image mask statistics first
+        logger.info("🔍 DEBUGGING: Analyzing image mask patterns...")
+        
+        # Sample a few small regions to understand masking
+        debug_regions = [
+            (0, 0, 100, 100),           # Top-left corner
+            (width//2-50, height//2-50, 100, 100),  # Center
+            (width-100, height-100, 100, 100),      # Bottom-right
+            (width//4, height//4, 100, 100),        # Quarter point
+            (3*width//4, 3*height//4, 100, 100)     # Three-quarter point
+        ]
+        
+        regions_with_vegetation = 0
+        for i, (x, y, w, h) in enumerate(debug_regions):
+            try:
+                # Ensure we don't go out of bounds
+                x = max(0, min(x, width - w))
+                y = max(0, min(y, height - h))
+                
+                window = Window(x, y, w, h)
+                red_sample, nir_sample = _read_band_windows(red_src, nir_src, window)
+                
+                # Check mask statistics and value ranges
+                if hasattr(red_sample, 'mask'):
+                    red_valid = (~red_sample.mask).sum()
+                    red_total = red_sample.size
+                    red_valid_pct = (red_valid / red_total) * 100
+                    red_nonzero = (red_sample[~red_sample.mask] > 1).sum() if red_valid > 0 else 0
+                else:
+                    red_valid = (~np.isnan(red_sample)).sum()
+                    red_total = red_sample.size
+                    red_valid_pct = (red_valid / red_total) * 100
+                    red_nonzero = (red_sample[~np.isnan(red_sample)] > 1).sum() if red_valid > 0 else 0
+                
+                if hasattr(nir_sample, 'mask'):
+                    nir_valid = (~nir_sample.mask).sum()
+                    nir_total = nir_sample.size
+                    nir_valid_pct = (nir_valid / nir_total) * 100
+                    nir_nonzero = (nir_sample[~nir_sample.mask] > 1).sum() if nir_valid > 0 else 0
+                else:
+                    nir_valid = (~np.isnan(nir_sample)).sum()
+                    nir_total = nir_sample.size
+                    nir_valid_pct = (nir_valid / nir_total) * 100
+                    nir_nonzero = (nir_sample[~np.isnan(nir_sample)] > 1).sum() if nir_valid > 0 else 0
+                
+                # Check vegetation presence (non-zero reflectance values)
+                vegetation_pixels = ((red_sample > 0) & (nir_sample > 0)).sum()
+                vegetation_pct = (vegetation_pixels / red_sample.size) * 100
+                
+                logger.info(f"🔍 Region {i+1} [{y}:{x}] - Valid: R={red_valid_pct:.1f}% N={nir_valid_pct:.1f}%, Vegetation: {vegetation_pct:.1f}%")
+                
+                if vegetation_pct > 10:  # At least 10% vegetation
+                    logger.info(f"✅ Found vegetation in region {i+1} with {vegetation_pct:.1f}% vegetation pixels!")
+                    regions_with_vegetation += 1
+                
+            except Exception as e:
+                logger.warning(f"⚠️ Error checking region {i+1}: {str(e)}")
+        
+        if regions_with_vegetation == 0:
+            logger.error("❌ No vegetation regions found in entire image!")
+            logger.error("💡 This image may be completely cloudy, water, or urban areas")
+    
+    def _transformer_to_wgs84(self, src_crs: str) -> Transformer:
+        """Return the transformer from src_crs to WGS 84, building it once per CRS"""
+        transformer = self._transformers.get(src_crs)
+        if transformer is None:
+            transformer = Transformer.from_crs(CRS(src_crs), self.TARGET_CRS, always_xy=True)
+            self._transformers[src_crs] = transformer
+        return transformer
+    
+    def _priority_chunk_origin(self, row: int, col: int, height: int, width: int,
+                               block_shape: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Clamp a priority chunk inside the image and snap it down onto the block grid
+        
+        Axes that are not tiled (e.g. a block spanning the full width) are left unsnapped.
+        """
+        
+        origin = []
+        for value, size, block in ((row, height, block_shape[0]), (col, width, block_shape[1])):
+            value = max(0, min(value, size - self.chunk_size))
+            if block < size:
+                value -= value % block
+            origin.append(value)
+        
+        return origin[0], origin[1]
+    
+    def _overlapping_grid_starts(self, offset: int) -> Tuple[int, ...]:
+        """Starts of the chunk grid cells that a chunk beginning at offset overlaps"""
+        start = offset - offset % self.chunk_size
+        if start == offset:
+            return (start,)
+        return (start, start + self.chunk_size)
     
     def _extract_chunk_pixel_data(self, red_chunk: np.ndarray, nir_chunk: np.ndarray, 
                                  ndvi_chunk: np.ndarray, transform, chunk_row: int, 
-                                 chunk_col: int, sampling_rate: int, src_crs: str) -> List[List[float]]:
+                                 chunk_col: int, sampling_rate: int, src_crs: str) -> np.ndarray:
         """
         Extract pixel feature vectors from a chunk with spatial coordinates
         
@@ -370,93 +504,85 @@ class VegetationProcessor:
             src_crs: Source Coordinate Reference System of the image
             
         Returns:
-            List of pixel feature vectors: [[ndvi, red, nir, lat, lng], ...]
+            (n, 5) float64 array of pixel feature vectors: [[ndvi, red, nir, lat, lng], ...]
         """
         
-        chunk_pixels = []
-        chunk_height, chunk_width = red_chunk.shape
-        
-        # Debug counters
-        total_sampled = 0
-        invalid_pixels = 0
-        coord_errors = 0
-        zero_value_pixels = 0
-        masked_pixels = 0
-        
-        # Create a transformer for coordinate reprojection
+        # Get the (cached) transformer for coordinate reprojection
         try:
-            source_crs = CRS(src_crs)
-            target_crs = CRS("EPSG:4326")  # WGS 84 (lat/lon)
-            transformer = Transformer.from_crs(source_crs, target_crs, always_xy=True)
+            transformer = self._transformer_to_wgs84(src_crs)
         except Exception as e:
             logger.error(f"❌ Failed to create coordinate transformer: {str(e)}")
-            return [] # Cannot proceed without a transformer
+            return np.empty((0, 5)) # Cannot proceed without a transformer
 
-        # Sample pixels from the chunk
-        for r in range(0, chunk_height, sampling_rate):
-            for c in range(0, chunk_width, sampling_rate):
-                total_sampled += 1
-                
-                # Get pixel values
-                red_val = red_chunk[r, c]
-                nir_val = nir_chunk[r, c]
-                ndvi_val = ndvi_chunk[r, c]
-                
-                # Skip no-data pixels (zero values in Sentinel-2 L2A indicate no data)
-                if red_val <= 0 or nir_val <= 0:
-                    invalid_pixels += 1
-                    zero_value_pixels += 1
-                    continue
-                
-                # Skip invalid pixels - handle masked arrays properly
-                red_masked = (hasattr(red_val, 'mask') and red_val.mask) or np.isnan(red_val) or np.isinf(red_val)
-                nir_masked = (hasattr(nir_val, 'mask') and nir_val.mask) or np.isnan(nir_val) or np.isinf(nir_val)
-                ndvi_masked = (hasattr(ndvi_val, 'mask') and ndvi_val.mask) or np.isnan(ndvi_val) or np.isinf(ndvi_val)
-                
-                if red_masked or nir_masked or ndvi_masked:
-                    invalid_pixels += 1
-                    masked_pixels += 1
-                    # Debug first invalid pixel
-                    if invalid_pixels == 1 and chunk_row < 512 and chunk_col < 512:
-                        logger.info(f"🔍 First invalid pixel debug: red_masked={red_masked}, nir_masked={nir_masked}, ndvi_masked={ndvi_masked}")
-                        logger.info(f"    red_val={red_val}, nir_val={nir_val}, ndvi_val={ndvi_val}")
-                        logger.info(f"    red_val type: {type(red_val)}, has mask: {hasattr(red_val, 'mask')}")
-                        if hasattr(red_val, 'mask'):
-                            logger.info(f"    red_val.mask: {red_val.mask}")
-                    continue
-                
-                # Calculate absolute pixel coordinates
-                abs_row = chunk_row + r
-                abs_col = chunk_col + c
-                
-                # Convert pixel coordinates to geographic coordinates (lat, lng)
-                try:
-                    # rasterio.transform.xy expects (rows, cols)
-                    x, y = xy(transform, abs_row, abs_col)
-
-                    # Reproject coordinates from source CRS to WGS 84
-                    lng, lat = transformer.transform(x, y)
-                    
-                    # Validate coordinates are reasonable
-                    if not (-180 <= lng <= 180 and -90 <= lat <= 90):
-                        coord_errors += 1
-                        continue
-                        
-                    # Create pixel feature vector: [ndvi, red, nir, lat, lng]
-                    pixel_features = [
-                        float(ndvi_val),
-                        float(red_val),
-                        float(nir_val),
-                        float(lat),
-                        float(lng)
-                    ]
-                    
-                    chunk_pixels.append(pixel_features)
-                    
-                except Exception as e:
-                    # Skip pixels with coordinate conversion errors
-                    coord_errors += 1
-                    continue
+        # Sample every Nth pixel of the chunk in one strided view per band
+        red_sampled = red_chunk[::sampling_rate, ::sampling_rate]
+        nir_sampled = nir_chunk[::sampling_rate, ::sampling_rate]
+        ndvi_sampled = ndvi_chunk[::sampling_rate, ::sampling_rate]
+        total_sampled = red_sampled.size
+        
+        red_values = np.ma.getdata(red_sampled)
+        nir_values = np.ma.getdata(nir_sampled)
+        ndvi_values = np.ma.getdata(ndvi_sampled)
+        
+        # Skip no-data pixels (zero values in Sentinel-2 L2A indicate no data)
+        zero_value = (
+            np.ma.filled(red_sampled <= 0, False) | np.ma.filled(nir_sampled <= 0, False)
+        )
+        
+        # Skip invalid pixels - handle masked arrays properly
+        masked = (
+            np.ma.getmaskarray(red_sampled) | ~np.isfinite(red_values) |
+            np.ma.getmaskarray(nir_sampled) | ~np.isfinite(nir_values) |
+            np.ma.getmaskarray(ndvi_sampled) | ~np.isfinite(ndvi_values)
+        ) & ~zero_value
+        
+        zero_value_pixels = int(np.count_nonzero(zero_value))
+        masked_pixels = int(np.count_nonzero(masked))
+        
+        # Debug first invalid pixel
+        if masked_pixels and chunk_row < 512 and chunk_col < 512:
+            r, c = np.argwhere(masked)[0]
+            logger.info(f"🔍 First invalid pixel debug: {masked_pixels} masked/non-finite samples")
+            logger.info(f"    red_val={red_sampled[r, c]}, nir_val={nir_sampled[r, c]}, ndvi_val={ndvi_sampled[r, c]}")
+        
+        valid = ~(zero_value | masked)
+        
+        # Absolute pixel coordinates of the valid samples (row-major, as sampled)
+        sample_rows, sample_cols = np.nonzero(valid)
+        abs_rows = chunk_row + sample_rows * sampling_rate
+        abs_cols = chunk_col + sample_cols * sampling_rate
+        
+        # Pixel centers in the source CRS - the affine transform inlined, in the same
+        # operation order as rasterio.transform.xy(offset='center') but without its
+        # per-call list conversion
+        center_cols = abs_cols + 0.5
+        center_rows = abs_rows + 0.5
+        xs = center_cols * transform.a + center_rows * transform.b + transform.c
+        ys = center_cols * transform.d + center_rows * transform.e + transform.f
+        
+        # Convert pixel coordinates to geographic coordinates (lat, lng) for the whole chunk
+        try:
+            # Reproject coordinates from source CRS to WGS 84
+            lngs, lats = transformer.transform(xs, ys)
+            lngs = np.asarray(lngs, dtype=np.float64)
+            lats = np.asarray(lats, dtype=np.float64)
+        except Exception as e:
+            # Skip the chunk if coordinate conversion fails
+            logger.warning(f"⚠️ Coordinate conversion failed for chunk [{chunk_row}:{chunk_col}]: {str(e)}")
+            return np.empty((0, 5))
+        
+        # Validate coordinates are reasonable
+        in_range = (lngs >= -180) & (lngs <= 180) & (lats >= -90) & (lats <= 90)
+        coord_errors = int(in_range.size - np.count_nonzero(in_range))
+        
+        # Create pixel feature vectors: [ndvi, red, nir, lat, lng]
+        chunk_pixels = np.column_stack((
+            ndvi_values[valid][in_range].astype(np.float64),
+            red_values[valid][in_range].astype(np.float64),
+            nir_values[valid][in_range].astype(np.float64),
+            lats[in_range],
+            lngs[in_range]
+        ))
         
         # Only log if we found valid pixels or if this is one of the first few chunks
         if len(chunk_pixels) > 0:
@@ -467,39 +593,50 @@ class VegetationProcessor:
         
         return chunk_pixels
     
-    def _calculate_ndvi_chunk(self, red: np.ndarray, nir: np.ndarray) -> np.ndarray:
+    def _calculate_ndvi_chunk(self, red: np.ndarray, nir: np.ndarray,
+                              buffers: Tuple[np.ndarray, np.ndarray, np.ndarray] = None) -> np.ndarray:
         """
         Calculate NDVI for a single chunk
         
         Args:
             red: Red band chunk (masked array)
             nir: NIR band chunk (masked array)
+            buffers: Optional float32 work buffers (at least chunk-sized) for the red,
+                NIR and denominator arrays; the returned NDVI is a view of the NIR one
             
         Returns:
             NDVI array for the chunk
         """
         
         # Convert to float32 to prevent overflow
-        red = red.astype(np.float32)
-        nir = nir.astype(np.float32)
-        
-        # Calculate NDVI with safe division
-        numerator = nir - red
-        denominator = nir + red
-        
-        # Identify no-data areas (both bands are zero or very low)
-        no_data_mask = (red <= 1) & (nir <= 1)  # Both bands essentially zero
-        
-        # Avoid division by zero
+        if buffers is None or np.ma.isMaskedArray(red) or np.ma.isMaskedArray(nir):
+            red = red.astype(np.float32)
+            nir = nir.astype(np.float32)
+            denominator = nir + red
+        else:
+            rows, cols = red.shape
+            red_f, nir_f, denominator = (buffer[:rows, :cols] for buffer in buffers)
+            np.copyto(red_f, red, casting='unsafe')
+            np.copyto(nir_f, nir, casting='unsafe')
+            red, nir = red_f, nir_f
+            np.add(nir, red, out=denominator)
+        
+        zero_denominator = denominator == 0
+        
+        # Identify no-data areas (both bands are zero or very low), accumulated in place
+        invalid = (red <= 1) & (nir <= 1)  # Both bands essentially zero
+        invalid |= zero_denominator
+        
+        # Numerator and NDVI share one buffer - the float32 NIR copy - instead of
+        # allocating separate numerator and output arrays
+        ndvi = np.subtract(nir, red, out=nir)
         with np.errstate(divide='ignore', invalid='ignore'):
-            ndvi = np.divide(numerator, denominator, 
-                           out=np.full_like(numerator, np.nan), 
-                           where=(denominator != 0))
-        
-        # Mask invalid values including no-data areas
-        ndvi_masked = np.ma.masked_where(
-            no_data_mask | (denominator == 0) | (ndvi < -1) | (ndvi > 1), 
-            ndvi
-        )
+            np.divide(ndvi, denominator, out=ndvi, where=~zero_denominator)
+        ndvi[zero_denominator] = np.nan
+        
+        # Mask invalid values including no-data areas (ndvi is our own buffer, so wrap it
+        # without the copy masked_where makes by default)
+        invalid |= np.abs(ndvi) > 1
+        ndvi_masked = np.ma.masked_where(invalid, ndvi, copy=False)
         
         return ndvi_masked 
\ No newline at end of file
@@ -12,9 +12,10 @@ import {
 } from '@aws-sdk/lib-dynamodb';
 import { SNSClient, SubscribeCommand, UnsubscribeCommand, ListSubscriptionsByTopicCommand } from '@aws-sdk/client-sns';
 import { LambdaClient, InvokeCommand } from '@aws-sdk/client-lambda';
-import { S3Client, GetObjectCommand, ListObjectsV2Command, PutObjectCommand } from '@aws-sdk/client-s3';
+import { S3Client, GetObjectCommand, GetObjectCommandOutput, ListObjectsV2Command, PutObjectCommand } from '@aws-sdk/client-s3';
 import { SFNClient, StartExecutionCommand, DescribeExecutionCommand, ListExecutionsCommand } from '@aws-sdk/client-sfn';
 import { randomUUID } from 'crypto';
+import { gunzipSync } from 'zlib';
 import { RegionDto, CreateRegionDto, AlertDto, AlertLevel, RegionStatus, MonitoringJobDto } from '../dto/dashboard.dto';
 
 @Injectable()
@@ -644,10 +645,10 @@ export class DashboardService {
       });
 
       const response = await this.s3Client.send(getCommand);
-      const qualityData = JSON.parse(await response.Body?.transformToString() || '{}');
+      const qualityData = await this.parseQualityMetricsObject(response);
 
       this.logger.log(`✅ Retrieved REAL quality metrics for region ${regionId}`);
-      return qualityData.quality_metrics || qualityData;
+      return await this.resolveTileQualityMetrics(qualityData);
     } catch (error) {
       this.logger.error(`Failed to fetch REAL quality metrics for region ${regionId}:`, error);
       throw new Error(`Failed to fetch real alert quality metrics from S3: ${error.message}`);
@@ -684,6 +685,8 @@ export class DashboardService {
           new Date(b.LastModified || 0).getTime() - new Date(a.LastModified || 0).getTime()
         );
 
+        // Tile files of the same run share one aggregate object - fetch each only once
+        const aggregateCache = new Map<string, Promise<any>>();
         const trendsData = await Promise.all(
           recentFiles.map(async (file) => {
             const getCommand = new GetObjectCommand({
@@ -691,16 +694,16 @@ export class DashboardService {
               Key: file.Key
             });
             const response = await this.s3Client.send(getCommand);
-            return JSON.parse(await response.Body?.transformToString() || '{}');
+            return this.resolveTileQualityMetrics(await this.parseQualityMetricsObject(response), aggregateCache);
           })
         );
 
         return {
-          trends: trendsData.map(data => data.quality_metrics || data),
+          trends: trendsData,
           summary: {
             totalAlerts: trendsData.length,
             averageQualityScore: trendsData.length > 0 
-              ? trendsData.reduce((sum, data) => sum + (data.quality_metrics?.overall_quality_score || 0), 0) / trendsData.length
+              ? trendsData.reduce((sum, data) => sum + (data?.overall_quality_score || 0), 0) / trendsData.length
               : 0,
             timeRange: days,
             regionId
@@ -730,7 +733,7 @@ export class DashboardService {
               Key: file.Key
             });
             const response = await this.s3Client.send(getCommand);
-            return JSON.parse(await response.Body?.transformToString() || '{}');
+            return this.parseQualityMetricsObject(response);
           })
         );
 
@@ -814,6 +817,44 @@ export class DashboardService {
     }
   }
 
+  /**
+   * Resolve the quality metrics of a per-tile S3 object. Newer objects only reference the
+   * aggregate object holding the full metrics (aggregate_ref); older ones embed quality_metrics.
+   * Pass an aggregateCache when resolving several tiles in one request so each aggregate is read once.
+   */
+  private async resolveTileQualityMetrics(tileData: any, aggregateCache?: Map<string, Promise<any>>): Promise<any> {
+    if (tileData.quality_metrics || !tileData.aggregate_ref) {
+      return tileData.quality_metrics || tileData;
+    }
+
+    let aggregateData = aggregateCache?.get(tileData.aggregate_ref);
+    if (!aggregateData) {
+      aggregateData = this.s3Client.send(new GetObjectCommand({
+        Bucket: this.processedDataBucket,
+        Key: tileData.aggregate_ref
+      })).then((response) => this.parseQualityMetricsObject(response));
+      aggregateCache?.set(tileData.aggregate_ref, aggregateData);
+    }
+
+    const aggregate = await aggregateData;
+    return aggregate.aggregate_quality_metrics || aggregate;
+  }
+
+  /**
+   * Parse an alert quality metrics object - the results consolidator stores them gzip-encoded
+   */
+  private async parseQualityMetricsObject(response: GetObjectCommandOutput): Promise<any> {
+    const body = await response.Body?.transformToByteArray();
+    if (!body || body.length === 0) {
+      return {};
+    }
+
+    const json = response.ContentEncoding === 'gzip'
+      ? gunzipSync(body).toString('utf-8')
+      : Buffer.from(body).toString('utf-8');
+    return JSON.parse(json);
+  }
+
   /**
    * Helper method to categorize quality scores
    */